@@ -1,12 +1,18 @@
 """QM Social League page: fixtures, stats, scorecards, and top performers views."""
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+import html
 import logging
 from io import BytesIO
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
+from pandas.api.types import is_numeric_dtype
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from src.guard import (
     APP_TITLE,
@@ -18,7 +24,8 @@ from src.guard import (
 )
 from src.dropbox_api import get_access_token, download_file, get_temporary_link
 from src.excel_io import load_league_workbook_from_bytes, load_named_table_from_bytes
-from src.db import list_scorecards, list_scorecard_match_ids
+from src.db import list_scorecards
+from src.scorecards import matches_with_scorecards
 
 st.set_page_config(page_title=f"{APP_TITLE} - QM Social League", layout="wide")
 
@@ -36,6 +43,285 @@ SEASON_SHEETS = {
     "Sem B 24/25": "Sem_B_24-25_Stats",
 }
 
+# Shared column configs for the stats tables (built once, reused on every rerun).
+RATE_STAT_COLS = ["Batting Strike Rate", "Batting Average", "Economy", "Bowling Strike Rate", "Bowling Average"]
+_NUM2 = st.column_config.NumberColumn(format="%.2f")
+_NUM_PLAIN = st.column_config.NumberColumn()
+_TEXT_PINNED = st.column_config.TextColumn(pinned=True)
+
+# Stateful tab styling for the st.radio navigation bar.
+_TABS_CSS = """
+    <style>
+    /* =========================================================
+       Stateful tabs built from st.radio (native Streamlit look)
+       ========================================================= */
+
+    /* --- Radiogroup container (acts like tab bar) --- */
+    div[role="radiogroup"] {
+        display: flex !important;
+        flex-direction: row !important;
+        gap: 1.25rem !important;
+        border-bottom: none !important;      /* no separator line */
+        padding-bottom: 0 !important;
+        margin-bottom: 1.25rem;
+    }
+
+    /* --- Each tab label --- */
+    div[role="radiogroup"] > label {
+        display: inline-flex !important;
+        align-items: center !important;
+        margin: 0 !important;
+        padding: 0.45rem 0 !important;
+        cursor: pointer !important;
+        background: transparent !important;
+        border: none !important;
+        gap: 0 !important;
+
+        /* Underline support (prevents layout quirks) */
+        border-bottom: 2px solid transparent !important;
+        text-decoration: none !important;
+    }
+
+    /* --- Hide radio controls ONLY (keep labels visible) --- */
+    div[role="radiogroup"] > label > div:first-child,
+    div[role="radiogroup"] > label > span:first-child {
+        display: none !important;
+        width: 0 !important;
+        height: 0 !important;
+        margin: 0 !important;
+        padding: 0 !important;
+    }
+
+    div[role="radiogroup"] > label svg {
+        display: none !important;
+        width: 0 !important;
+        height: 0 !important;
+    }
+
+    div[role="radiogroup"] input[type="radio"] {
+        position: absolute !important;
+        opacity: 0 !important;
+        width: 0 !important;
+        height: 0 !important;
+        pointer-events: none !important;
+    }
+
+    /* --- Tab text container (Streamlit varies between div/span) --- */
+    div[role="radiogroup"] > label > div,
+    div[role="radiogroup"] > label > span {
+        padding: 0 !important;
+        font-weight: 500 !important;
+        color: rgba(49, 51, 63, 0.75) !important;   /* unselected (light) */
+    }
+
+    /* Hover (light mode) */
+    div[role="radiogroup"] > label:hover > div,
+    div[role="radiogroup"] > label:hover > span {
+        color: rgba(49, 51, 63, 1) !important;
+    }
+
+    /* Selected tab (light mode): underline + red text */
+    div[role="radiogroup"] > label:has(input:checked) {
+        border-bottom-color: rgba(255, 0, 0, 0.85) !important;
+    }
+
+    div[role="radiogroup"] > label:has(input:checked) > div,
+    div[role="radiogroup"] > label:has(input:checked) > span {
+        font-weight: 600 !important;
+        color: rgba(255, 0, 0, 0.85) !important;    /* selected red */
+    }
+
+    /* =========================================================
+       Dark mode: unselected white, selected red, underline red
+       ========================================================= */
+    @media (prefers-color-scheme: dark) {
+
+        /* Unselected */
+        div[role="radiogroup"] > label > div,
+        div[role="radiogroup"] > label > span {
+            color: rgba(255, 255, 255, 0.90) !important;
+        }
+
+        /* Hover */
+        div[role="radiogroup"] > label:hover > div,
+        div[role="radiogroup"] > label:hover > span {
+            color: rgba(255, 255, 255, 1) !important;
+        }
+
+        /* Selected */
+        div[role="radiogroup"] > label:has(input:checked) {
+            border-bottom-color: rgba(255, 0, 0, 0.90) !important;
+        }
+
+        div[role="radiogroup"] > label:has(input:checked) > div,
+        div[role="radiogroup"] > label:has(input:checked) > span {
+            color: rgba(255, 0, 0, 0.90) !important;
+        }
+    }
+    </style>
+    """
+
+# League Table styling, wrapped around the HTML rendered by _render_league_table_html.
+_LT_CSS = """
+    <style>
+        .lt-wrap {
+        width: 100%;
+        border: 1px solid rgba(49, 51, 63, 0.15);
+        border-radius: 0.5rem;
+        overflow: hidden;
+        background: white;
+        padding-bottom: 0;
+      }
+
+        .lt-scroll {
+        width: 100%;
+        overflow-x: auto;
+        overflow-y: hidden;
+      }
+
+        .lt-wrap table {
+        width: 100%;
+        border-collapse: separate;
+        border-spacing: 0;
+        font-size: 0.95rem;
+        border-top: none !important;
+        border-bottom: none !important;
+        margin: 0 !important;
+        padding: 0 !important;
+      }
+
+        .lt-wrap thead th {
+        position: sticky;
+        top: 0;
+        z-index: 2;
+        background: rgba(250, 250, 252, 1);
+        color: rgba(49, 51, 63, 0.9);
+        text-align: left;
+        font-weight: 600;
+        padding: 0.65rem 0.75rem;
+        border-bottom: 1px solid rgba(49, 51, 63, 0.15);
+        white-space: nowrap;
+      }
+
+        .lt-wrap tbody td {
+        padding: 0.6rem 0.75rem;
+        border-bottom: 1px solid rgba(49, 51, 63, 0.08);
+        color: rgba(49, 51, 63, 0.95);
+        white-space: nowrap;
+      }
+
+        .lt-wrap tbody td:not(:nth-child(2)),
+        .lt-wrap thead th:not(:nth-child(2)) {
+        text-align: center;
+      }
+
+        .lt-wrap tbody tr:nth-child(1) td { background: rgba(255, 215, 0, 0.08); }
+        .lt-wrap tbody tr:nth-child(2) td { background: rgba(192, 192, 192, 0.22); }
+        .lt-wrap tbody tr:nth-child(3) td { background: rgba(205, 127, 50, 0.10); }
+
+        .lt-wrap tbody tr:last-child td { border-bottom: 1px solid transparent; }
+
+        .lt-wrap tbody tr:hover td { background: rgba(240, 242, 246, 1); }
+
+        .lt-wrap table, .lt-wrap th, .lt-wrap td {
+        border-left: none !important;
+        border-right: none !important;
+      }
+
+    @media (prefers-color-scheme: dark) {
+
+        .lt-wrap {
+            background: rgba(14, 17, 23, 1) !important;
+            border: 1px solid rgba(255, 255, 255, 0.12) !important;
+        }
+
+        .lt-wrap table {
+            background: transparent !important;
+        }
+
+        .lt-wrap thead th {
+            background: rgba(28, 31, 38, 1) !important;
+            color: rgba(255, 255, 255, 0.90) !important;
+            border-bottom: 1px solid rgba(255, 255, 255, 0.12) !important;
+        }
+
+        .lt-wrap tbody td {
+            color: rgba(255, 255, 255, 0.88) !important;
+            border-bottom: 1px solid rgba(255, 255, 255, 0.08) !important;
+        }
+
+        .lt-wrap tbody tr:hover td {
+            background: rgba(255, 255, 255, 0.06) !important;
+        }
+
+        .lt-wrap tbody tr:nth-child(1) td { background: rgba(255, 215, 0, 0.10) !important; }
+        .lt-wrap tbody tr:nth-child(2) td { background: rgba(192, 192, 192, 0.10) !important; }
+        .lt-wrap tbody tr:nth-child(3) td { background: rgba(205, 127, 50, 0.10) !important; }
+
+        .lt-wrap table, .lt-wrap th, .lt-wrap td {
+            border-left: none !important;
+            border-right: none !important;
+        }
+    }
+
+    </style>
+    """
+
+# Stat groups offered in the stats multiselects.
+BATTING_STATS = (
+    "Runs Scored",
+    "Balls Faced",
+    "6s",
+    "Retirements",
+    "Batting Strike Rate",
+    "Batting Average",
+    "Highest Score",
+    "Innings Played",
+    "Not Out's",
+)
+BOWLING_STATS = (
+    "Overs",
+    "Balls Bowled",
+    "Maidens",
+    "Runs Conceded",
+    "Wickets",
+    "Wides",
+    "No Balls",
+    "Economy",
+    "Bowling Strike Rate",
+    "Bowling Average",
+    "Best Figures",
+)
+FIELDING_STATS = ("Catches", "Run Outs", "Stumpings")
+# Single team player table also offers Total Overs.
+TEAM_PLAYER_BOWLING_STATS = ("Total Overs",) + BOWLING_STATS
+TEAM_BATTING_STATS = (
+    "Runs Scored",
+    "Balls Faced",
+    "6s",
+    "Retirements",
+    "Batting Strike Rate",
+    "Batting Average",
+)
+TEAM_BOWLING_STATS = (
+    "Overs",
+    "Balls Bowled",
+    "Maidens",
+    "Runs Conceded",
+    "Wickets",
+    "Wides",
+    "No Balls",
+    "Economy",
+    "Bowling Strike Rate",
+    "Bowling Average",
+)
+TEAM_FIELDING_STATS = FIELDING_STATS
+TEAM_STAT_GROUPS = {
+    **{c: "batting" for c in TEAM_BATTING_STATS},
+    **{c: "bowling" for c in TEAM_BOWLING_STATS},
+    **{c: "fielding" for c in TEAM_FIELDING_STATS},
+}
+
 
 def _get_secret(name: str) -> str:
     val = st.secrets.get(name, "")
@@ -44,76 +330,256 @@ def _get_secret(name: str) -> str:
     return str(val)
 
 
-@st.cache_data(ttl=60, show_spinner=False)
+@st.cache_resource(ttl=60, show_spinner=False)
 def _load_from_dropbox(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str):
+    """
+    Download and parse the league workbook, returning (workbook bytes, parsed tables).
+    Shared read-only across reruns and sessions: no output hashing or copying on a cache hit,
+    so callers must copy any frame before modifying it.
+    """
     access_token = get_access_token(app_key, app_secret, refresh_token)
     xbytes = download_file(access_token, dropbox_path)
-    return load_league_workbook_from_bytes(xbytes)
+    data = load_league_workbook_from_bytes(xbytes)
 
+    # Coerce League_Data stats once per load so the tabs' own coercion finds numeric columns.
+    if data.league_data is not None:
+        league_data = data.league_data.copy()
+        _coerce_numeric(league_data, PLAYER_STATS_NUMERIC_COLS)
+        data = replace(data, league_data=league_data)
+    return xbytes, data
 
-@st.cache_data(ttl=60, show_spinner=False)
-def _download_workbook_bytes(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str) -> bytes:
-    access_token = get_access_token(app_key, app_secret, refresh_token)
-    return download_file(access_token, dropbox_path)
+
+@st.cache_resource(ttl=3000, show_spinner=False)
+def _cached_access_token(app_key: str, app_secret: str, refresh_token: str) -> str:
+    # Dropbox access tokens last ~4h; refreshing every 50 minutes keeps a safe margin.
+    return get_access_token(app_key, app_secret, refresh_token)
+
+
+def _fetch_per_path(fetch, access_token: str, dropbox_paths: tuple[str, ...]) -> tuple[dict, dict[str, str]]:
+    """
+    Run fetch(path, access_token) for each path concurrently.
+    Returns (results by path, error messages by path). Errors are collected here, outside
+    the cached per-path call, so a transient failure is retried on the next rerun.
+    """
+    ctx = get_script_run_ctx()
+
+    def _fetch_one(path: str) -> tuple[str, object, str | None]:
+        try:
+            return path, fetch(path, access_token), None
+        except Exception as e:
+            return path, None, str(e)
+
+    results: dict = {}
+    errors: dict[str, str] = {}
+    # Network-bound round-trips, so threads overlap the waiting; workers share this
+    # script run's context so the cached calls behave as on the main thread.
+    with ThreadPoolExecutor(max_workers=8, initializer=add_script_run_ctx, initargs=(None, ctx)) as pool:
+        for path, value, err in pool.map(_fetch_one, dropbox_paths):
+            if err is None:
+                results[path] = value
+            else:
+                errors[path] = err or "unknown error"
+    return results, errors
 
 
 @st.cache_data(ttl=300, show_spinner=False)
-def _download_scorecard_bytes(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str) -> bytes:
+def _download_scorecard_bytes(dropbox_path: str, _access_token: str) -> bytes:
     """Download a scorecard file from Dropbox (cached briefly for UX)."""
-    access_token = get_access_token(app_key, app_secret, refresh_token)
-    return download_file(access_token, dropbox_path)
+    return download_file(_access_token, dropbox_path)
 
 
-@st.cache_data(ttl=60, show_spinner=False)
-def _get_temp_link(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str) -> str:
-    access_token = get_access_token(app_key, app_secret, refresh_token)
-    return get_temporary_link(access_token, dropbox_path)
+def _download_scorecards_bytes(
+    app_key: str,
+    app_secret: str,
+    refresh_token: str,
+    dropbox_paths: tuple[str, ...],
+) -> tuple[dict[str, bytes], dict[str, str]]:
+    """
+    Download several scorecard files concurrently with one access token.
+    Returns (bytes by path, error messages by path).
+    """
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
+    return _fetch_per_path(_download_scorecard_bytes, access_token, dropbox_paths)
 
 
 @st.cache_data(ttl=60, show_spinner=False)
-def _match_has_scorecards(match_id: str) -> bool:
-    """Fast check to filter the fixture selector to only fixtures with uploads."""
-    return len(list_scorecards(match_id)) > 0
+def _get_temp_link(dropbox_path: str, _access_token: str) -> str:
+    """Create a temporary Dropbox link for a scorecard (cached briefly; links expire)."""
+    return get_temporary_link(_access_token, dropbox_path)
+
+
+def _get_temp_links(
+    app_key: str,
+    app_secret: str,
+    refresh_token: str,
+    dropbox_paths: tuple[str, ...],
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Create temporary links for several scorecards concurrently with one access token.
+    Returns (links by path, error messages by path).
+    """
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
+    return _fetch_per_path(_get_temp_link, access_token, dropbox_paths)
+
+
+_MONTH_ABBR = np.array(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], dtype=object)
 
 
 def _format_date_dd_mmm(series: pd.Series) -> pd.Series:
+    # Build "dd-Mon" from day/month integers instead of per-element strftime.
     dt = pd.to_datetime(series, errors="coerce", dayfirst=True)
-    return dt.dt.strftime("%d-%b").fillna(series.astype(str))
+    out = series.astype(str)
+    valid = dt.notna()
+    if valid.any():
+        out = out.copy()
+        day = dt[valid].dt.day.astype(str).str.zfill(2)
+        out[valid] = day + "-" + _MONTH_ABBR[dt[valid].dt.month.to_numpy() - 1]
+    return out
+
+
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I %p", "%I:%M %p")
+
+
+def _parse_time_of_day(raw: pd.Series) -> pd.Series:
+    # One exact-format parse per pattern on the still-unparsed rows; no dateutil inference.
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    for fmt in _TIME_FORMATS:
+        missing = parsed.isna() & raw.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(raw[missing], format=fmt, errors="coerce")
+    return parsed
 
 
 def _format_time_ampm(series: pd.Series) -> pd.Series:
-    formats = ("%H:%M", "%H:%M:%S", "%I %p", "%I:%M %p")
-
-    def _format_one(val: object) -> str:
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return str(val)
-        raw = str(val).strip()
-        if not raw or raw.lower() == "nan":
-            return raw
-        for fmt in formats:
-            try:
-                parsed = datetime.strptime(raw, fmt)
-            except ValueError:
-                continue
-            hour = parsed.strftime("%I").lstrip("0") or "12"
-            if parsed.minute == 0:
-                return f"{hour} {parsed.strftime('%p')}"
-            return f"{hour}:{parsed.strftime('%M')} {parsed.strftime('%p')}"
+    # Vectorised: parse once via _parse_time_of_day, then build labels from hour/minute arrays.
+    # Unparseable values are returned as their stripped text.
+    raw = series.astype(str).str.strip()
+    parsed = _parse_time_of_day(raw)
+
+    valid = parsed.notna()
+    if not valid.any():
         return raw
 
-    return series.apply(_format_one)
+    hour = parsed[valid].dt.hour
+    minute = parsed[valid].dt.minute
+    hour12 = (hour % 12).replace(0, 12).astype(str)
+    mins = (":" + minute.astype(str).str.zfill(2)).where(minute != 0, "")
+    suffix = pd.Series(np.where(hour < 12, "AM", "PM"), index=hour.index)
 
+    out = raw.copy()
+    out[valid] = hour12 + mins + " " + suffix
+    return out
 
-def _find_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    cols = list(df.columns)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _format_fixture_datetimes(fixtures_df: pd.DataFrame) -> pd.DataFrame:
+    """Fixtures with Date/Time formatted for display; shared by the Fixtures tab and the scorecard selector."""
+    out = fixtures_df.copy()
+    if "Date" in out.columns:
+        out["Date"] = _format_date_dd_mmm(out["Date"])
+    if "Time" in out.columns:
+        out["Time"] = _format_time_ampm(out["Time"])
+    return out
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _build_fixture_options(fixtures_df: pd.DataFrame) -> tuple[list[str], dict[str, str]]:
+    """
+    Scorecard selector labels ("01-Jan - 7 PM - Home vs Away") and the label -> MatchID map.
+    Only fixtures with a MatchID are included.
+    """
+    # Same formatted Date/Time frame the Fixtures tab renders
+    fsel = _format_fixture_datetimes(fixtures_df)
+
+    def _safe(col: str) -> pd.Series:
+        if col not in fsel.columns:
+            return pd.Series("", index=fsel.index, dtype=object)
+        # One NA mask at numpy level instead of a where() pass that re-aligns on the index.
+        values = fsel[col]
+        text = values.astype(str).str.strip().to_numpy(dtype=object)
+        return pd.Series(np.where(values.isna().to_numpy(), "", text), index=fsel.index, dtype=object)
+
+    def _join_nonempty(left: pd.Series, right: pd.Series) -> pd.Series:
+        both = np.where(right == "", left, left + " - " + right)
+        return pd.Series(np.where(left == "", right, both), index=left.index)
+
+    # Build all fixture options column-wise.
+    # Dropdown label for normal users: "01-Jan - 7 PM - Home vs Away"
+    mid = _safe("MatchID")
+    date_txt = _safe("Date")
+
+    # Time is already formatted earlier via _format_time_ampm; reduce to "H AM/PM"
+    # Examples handled: "7:00 PM" -> "7 PM", "7 PM" -> "7 PM"
+    time_txt = _safe("Time")
+    t = time_txt.str.replace(".", "", regex=False).str.strip()
+    hour_part = t.str.split(":", n=1).str[0].fillna("").str.strip()
+    ampm_part = t.str.split(" ", n=1).str[-1].fillna("").str.strip().str.upper()
+    words = t.str.split()
+    spaced_txt = words.str[0].fillna("") + " " + words.str[-1].fillna("").str.upper()
+    time_txt = pd.Series(
+        np.where(
+            time_txt == "",
+            "",
+            np.where(
+                t.str.contains(":", regex=False),
+                hour_part + " " + ampm_part,
+                np.where(words.str.len() >= 2, spaced_txt, time_txt),
+            ),
+        ),
+        index=fsel.index,
+    )
+
+    if "Home Team" in fsel.columns and "Away Team" in fsel.columns:
+        match_txt = _safe("Home Team") + " vs " + _safe("Away Team")
+    else:
+        match_txt = pd.Series("", index=fsel.index, dtype=object)
+
+    labels = _join_nonempty(_join_nonempty(date_txt, time_txt), match_txt)
+    has_mid = (mid != "").to_numpy()
+    options: list[str] = labels[has_mid].tolist()
+    return options, dict(zip(options, mid[has_mid].tolist()))
+
+
+def _sort_desc(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    # Stable descending sort with blanks last, via one argsort and a positional take
+    # (cheaper than sort_values on the small frames rendered here).
+    vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+    return df.iloc[np.argsort(-np.nan_to_num(vals, nan=-np.inf), kind="stable")]
+
+
+@lru_cache(maxsize=256)
+def _find_col_cached(cols: tuple, candidates: tuple[str, ...]) -> str | None:
     for c in candidates:
         if c in cols:
             return c
     return None
 
 
-def _find_col_case_insensitive(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    lookup = {str(c).strip().casefold(): c for c in df.columns}
+def _present_cols(candidates, df: pd.DataFrame) -> list[str]:
+    """Candidates that exist in df, in candidate order (hash-based Index intersection)."""
+    return list(pd.Index(candidates).intersection(df.columns, sort=False))
+
+
+def _coerce_numeric(df: pd.DataFrame, candidates, **to_numeric_kwargs) -> None:
+    """
+    In place: coerce the candidate columns present in df to numbers (errors become NaN),
+    skipping columns that are already numeric, in one block assignment.
+    """
+    todo = [c for c in _present_cols(candidates, df) if not is_numeric_dtype(df[c])]
+    if todo:
+        df[todo] = df[todo].apply(pd.to_numeric, errors="coerce", **to_numeric_kwargs)
+
+
+def _find_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    # Column sets are stable per workbook load, so resolutions are memoised across reruns.
+    return _find_col_cached(tuple(df.columns), tuple(candidates))
+
+
+@lru_cache(maxsize=256)
+def _find_col_case_insensitive_cached(cols: tuple, candidates: tuple[str, ...]) -> str | None:
+    lookup = {str(c).strip().casefold(): c for c in cols}
     for c in candidates:
         found = lookup.get(str(c).strip().casefold())
         if found is not None:
@@ -121,6 +587,11 @@ def _find_col_case_insensitive(df: pd.DataFrame, candidates: list[str]) -> str |
     return None
 
 
+def _find_col_case_insensitive(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    # Memoised like _find_col, so the casefold lookup is built once per column set.
+    return _find_col_case_insensitive_cached(tuple(df.columns), tuple(candidates))
+
+
 def _filter_valid_players(df: pd.DataFrame) -> pd.DataFrame:
     """
     Keep only real player rows.
@@ -429,72 +900,129 @@ def load_combined_stats_table(workbook_bytes: bytes, table_name: str = "Combined
     return df if df is not None else pd.DataFrame()
 
 
-def render_player_stats_ui(
+PLAYER_STATS_NUMERIC_COLS = [
+    "Runs Scored",
+    "Balls Faced",
+    "6s",
+    "Retirements",
+    "Batting Strike Rate",
+    "Batting Average",
+    "Highest Score",
+    "Innings Played",
+    "Not Out's",
+    "Total Overs",
+    "Overs",
+    "Balls Bowled",
+    "Maidens",
+    "Runs Conceded",
+    "Wickets",
+    "Wides",
+    "No Balls",
+    "Economy",
+    "Bowling Strike Rate",
+    "Bowling Average",
+    "Catches",
+    "Run Outs",
+    "Stumpings",
+    "Fantasy Points",
+]
+
+
+@st.cache_resource(ttl=300, show_spinner=False, max_entries=4)
+def _team_id_maps(teams_df: pd.DataFrame) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    TeamID -> team name and team name -> TeamID from Teams_Table, skipping blanks.
+    Built once per data load and shared read-only by the Teams and Player Stats tabs.
+    """
+    # Workbook table headers are already stripped by the loader, so no copy is needed here.
+    team_id_col = _find_col(teams_df, ["TeamID", "Team Id", "Team ID"])
+    team_name_col = _find_col(teams_df, ["Team Names", "Team Name", "Team"])
+    if not (team_id_col and team_name_col):
+        return {}, {}
+
+    ids = teams_df[team_id_col].astype("string").str.strip()
+    names = teams_df[team_name_col].astype("string").str.strip()
+    keep = (ids.fillna("") != "") & (names.fillna("") != "")
+    ids, names = ids[keep].tolist(), names[keep].tolist()
+    return dict(zip(ids, names)), dict(zip(names, ids))
+
+
+def _map_team_names(team_ids: pd.Series, team_id_to_name: dict[str, str]) -> pd.Series:
+    # Few distinct TeamIDs, many rows: resolve codes against the known IDs in one indexer pass
+    # and gather names by code instead of a dict lookup per row.
+    # Unknown/blank IDs (code -1) hit the trailing None.
+    codes = pd.Index(list(team_id_to_name)).get_indexer(team_ids)
+    names = np.array([*team_id_to_name.values(), None], dtype=object)
+    return pd.Series(names[codes], index=team_ids.index)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _prepare_player_stats_frame(
     df: pd.DataFrame,
-    enable_team_filter: bool,
-    current_season: bool,
     teams_df: pd.DataFrame | None = None,
-    season_label: str | None = None,
-) -> None:
+) -> tuple[pd.DataFrame, dict[str, str], dict[str, str], dict[str, list[str]]]:
+    """
+    Normalise a player stats table once per data load: strip headers, map TeamID to team name,
+    coerce numeric stats and pre-sort by Fantasy Points so filtered views keep that order.
+    Also returns the sorted player-name options: all players under "" and each TeamID's players.
+    """
     league = df.copy()
     league.columns = [str(c).strip() for c in league.columns]
 
     team_id_col_league = _find_col(league, ["TeamID", "Team Id", "Team ID"])
-    name_col = _find_col(league, ["Name", "Player", "Player Name"])
-    if not name_col:
-        st.info("No player stats found yet (player name column is missing).")
-        return
 
     team_id_to_name: dict[str, str] = {}
     team_name_to_id: dict[str, str] = {}
     if teams_df is not None and not teams_df.empty:
-        teams = teams_df.copy()
-        teams.columns = [str(c).strip() for c in teams.columns]
-        team_id_col_teams = _find_col(teams, ["TeamID", "Team Id", "Team ID"])
-        team_name_col_teams = _find_col(teams, ["Team Names", "Team Name", "Team"])
-        if team_id_col_teams and team_name_col_teams:
-            ttmp = teams[[team_id_col_teams, team_name_col_teams]].copy()
-            ttmp[team_id_col_teams] = ttmp[team_id_col_teams].astype(str).str.strip()
-            ttmp[team_name_col_teams] = ttmp[team_name_col_teams].astype(str).str.strip()
-            ttmp = ttmp[(ttmp[team_id_col_teams] != "") & (ttmp[team_name_col_teams] != "")].drop_duplicates()
-            team_id_to_name = dict(zip(ttmp[team_id_col_teams], ttmp[team_name_col_teams]))
-            team_name_to_id = dict(zip(ttmp[team_name_col_teams], ttmp[team_id_col_teams]))
+        team_id_to_name, team_name_to_id = _team_id_maps(teams_df)
 
     if team_id_col_league and team_id_col_league in league.columns and team_id_to_name:
-        league[team_id_col_league] = league[team_id_col_league].astype(str).str.strip()
-        league["Team"] = league[team_id_col_league].map(team_id_to_name)
+        league[team_id_col_league] = league[team_id_col_league].astype("string").str.strip()
+        league["Team"] = _map_team_names(league[team_id_col_league], team_id_to_name)
     elif "Team" not in league.columns:
         league["Team"] = None
 
-    numeric_cols = [
-        "Runs Scored",
-        "Balls Faced",
-        "6s",
-        "Retirements",
-        "Batting Strike Rate",
-        "Batting Average",
-        "Highest Score",
-        "Innings Played",
-        "Not Out's",
-        "Total Overs",
-        "Overs",
-        "Balls Bowled",
-        "Maidens",
-        "Runs Conceded",
-        "Wickets",
-        "Wides",
-        "No Balls",
-        "Economy",
-        "Bowling Strike Rate",
-        "Bowling Average",
-        "Catches",
-        "Run Outs",
-        "Stumpings",
-        "Fantasy Points",
-    ]
-    for col in numeric_cols:
-        if col in league.columns:
-            league[col] = pd.to_numeric(league[col], errors="coerce")
+    # Whole-number stat columns are downcast to the smallest int dtype to shrink the
+    # serialised table; columns with fractions or blanks stay float64. Display-only:
+    # League_Data itself stays int64/float64 because the Teams tab sums it.
+    _coerce_numeric(league, PLAYER_STATS_NUMERIC_COLS)
+    stat_cols = _present_cols(PLAYER_STATS_NUMERIC_COLS, league)
+    if stat_cols:
+        league[stat_cols] = league[stat_cols].apply(pd.to_numeric, downcast="integer")
+
+    # Boolean filters preserve row order, so sorting here saves a sort on every rerun.
+    if "Fantasy Points" in league.columns:
+        league = _sort_desc(league, "Fantasy Points")
+
+    player_options: dict[str, list[str]] = {"": []}
+    name_col = _find_col(league, ["Name", "Player", "Player Name"])
+    if name_col:
+        names = league[name_col].astype("string").str.strip()
+        # Stored as a category of stripped names so the player filter compares integer codes.
+        league[name_col] = names.astype("category")
+        valid = (names != "").fillna(False)
+        player_options[""] = sorted(set(names[valid].tolist()))
+        if team_id_col_league and team_id_to_name:
+            for team_id, team_players in names[valid].groupby(league.loc[valid, team_id_col_league], sort=False):
+                player_options[str(team_id)] = sorted(set(team_players.tolist()))
+
+    return league, team_id_to_name, team_name_to_id, player_options
+
+
+def render_player_stats_ui(
+    df: pd.DataFrame,
+    enable_team_filter: bool,
+    current_season: bool,
+    teams_df: pd.DataFrame | None = None,
+    season_label: str | None = None,
+) -> None:
+    league, team_id_to_name, team_name_to_id, player_options = _prepare_player_stats_frame(df, teams_df)
+
+    team_id_col_league = _find_col(league, ["TeamID", "Team Id", "Team ID"])
+    name_col = _find_col(league, ["Name", "Player", "Player Name"])
+    if not name_col:
+        st.info("No player stats found yet (player name column is missing).")
+        return
 
     selected_team_id = None
     if enable_team_filter:
@@ -511,18 +1039,15 @@ def render_player_stats_ui(
     else:
         c1 = st.container()
 
-    player_options_df = league
+    team_mask = None
+    player_options_key = ""
     if selected_team_id is not None and team_id_col_league and team_id_col_league in league.columns:
-        player_options_df = league[
-            league[team_id_col_league].astype(str).str.strip() == str(selected_team_id).strip()
-        ]
-
-    player_options = (
-        player_options_df[name_col].dropna().astype(str).map(str.strip)
-        if name_col and name_col in player_options_df.columns
-        else pd.Series(dtype=str)
-    )
-    player_options_list = sorted([p for p in player_options.unique().tolist() if p != ""])
+        # TeamID was stripped once in _prepare_player_stats_frame.
+        player_options_key = str(selected_team_id).strip()
+        team_mask = league[team_id_col_league].to_numpy(dtype=object, na_value="") == player_options_key
+
+    # Precomputed per data load, so the dedupe + sort does not rerun on every widget change.
+    player_options_list = player_options.get(player_options_key, [])
 
     current_players = st.session_state.get("ps_players", [])
     current_players = [p for p in current_players if p in player_options_list]
@@ -535,41 +1060,20 @@ def render_player_stats_ui(
             key="ps_players",
         )
 
-    filtered = league.copy()
-    if selected_team_id is not None and team_id_col_league and team_id_col_league in filtered.columns:
-        filtered = filtered[filtered[team_id_col_league].astype(str).str.strip() == str(selected_team_id).strip()]
-    if name_col and name_col in filtered.columns and selected_players:
-        filtered = filtered[filtered[name_col].astype(str).str.strip().isin(selected_players)]
-
-    BATTING_STATS = [
-        "Runs Scored",
-        "Balls Faced",
-        "6s",
-        "Retirements",
-        "Batting Strike Rate",
-        "Batting Average",
-        "Highest Score",
-        "Innings Played",
-        "Not Out's",
-    ]
-    BOWLING_STATS = [
-        "Overs",
-        "Balls Bowled",
-        "Maidens",
-        "Runs Conceded",
-        "Wickets",
-        "Wides",
-        "No Balls",
-        "Economy",
-        "Bowling Strike Rate",
-        "Bowling Average",
-        "Best Figures",
-    ]
-    FIELDING_STATS = ["Catches", "Run Outs", "Stumpings"]
-
-    batting_options = [c for c in BATTING_STATS if c in filtered.columns]
-    bowling_options = [c for c in BOWLING_STATS if c in filtered.columns]
-    fielding_options = [c for c in FIELDING_STATS if c in filtered.columns]
+    row_mask = team_mask
+    if name_col and name_col in league.columns and selected_players:
+        # Name is a category of stripped names (see _prepare_player_stats_frame): match on codes.
+        name_cat = league[name_col].cat
+        chosen = name_cat.categories.get_indexer(selected_players)
+        name_mask = np.isin(name_cat.codes.to_numpy(), chosen[chosen >= 0])
+        row_mask = name_mask if row_mask is None else (row_mask & name_mask)
+    filtered = league[row_mask] if row_mask is not None else league
+    # One hashed set for the many column-membership checks below.
+    filtered_cols = set(filtered.columns)
+
+    batting_options = [c for c in BATTING_STATS if c in filtered_cols]
+    bowling_options = [c for c in BOWLING_STATS if c in filtered_cols]
+    fielding_options = [c for c in FIELDING_STATS if c in filtered_cols]
     other_aliases = {
         "Fantasy Points": ["Fantasy Points", "Total Fantasy Points", "Fantasy Points Total", "Points"],
         "Average Fantasy Points": [
@@ -584,7 +1088,7 @@ def render_player_stats_ui(
     other_display_to_actual: dict[str, str] = {}
     for display_name, aliases in other_aliases.items():
         mapped_col = _find_col(filtered, aliases)
-        if mapped_col and mapped_col in filtered.columns:
+        if mapped_col and mapped_col in filtered_cols:
             other_display_to_actual[display_name] = mapped_col
     other_options = [d for d in ["Fantasy Points", "Average Fantasy Points", "Matches Played"] if d in other_display_to_actual]
 
@@ -658,33 +1162,29 @@ def render_player_stats_ui(
     selected_columns = resolved_batting + resolved_bowling + resolved_fielding + resolved_other
 
     fixed_cols: list[str] = []
-    if "Name" in filtered.columns:
+    if "Name" in filtered_cols:
         fixed_cols.append("Name")
-    elif name_col and name_col in filtered.columns:
+    elif name_col and name_col in filtered_cols:
         fixed_cols.append(name_col)
     display_cols: list[str] = []
-    for c in fixed_cols:
-        if c and c in filtered.columns and c not in display_cols:
-            display_cols.append(c)
-    for c in selected_columns:
-        if c in filtered.columns and c not in display_cols:
+    seen_cols: set[str] = set()
+    for c in fixed_cols + selected_columns:
+        if c and c in filtered_cols and c not in seen_cols:
+            seen_cols.add(c)
             display_cols.append(c)
 
-    view = filtered[display_cols].copy() if all(c in filtered.columns for c in display_cols) else filtered.copy()
-    if "Fantasy Points" in view.columns:
-        try:
-            view = view.sort_values(by="Fantasy Points", ascending=False)
-        except Exception:
-            pass
+    # Read-only slice for rendering; no copy needed.
+    view = filtered.loc[:, display_cols] if display_cols else filtered
+    view_cols = set(view.columns)
 
     col_config: dict = {}
-    if "Name" in view.columns:
-        col_config["Name"] = st.column_config.TextColumn(pinned=True)
-    elif name_col and name_col in view.columns:
-        col_config[name_col] = st.column_config.TextColumn(pinned=True)
-    for c in ["Batting Strike Rate", "Batting Average", "Economy", "Bowling Strike Rate", "Bowling Average"]:
-        if c in view.columns:
-            col_config[c] = st.column_config.NumberColumn(format="%.2f")
+    if "Name" in view_cols:
+        col_config["Name"] = _TEXT_PINNED
+    elif name_col and name_col in view_cols:
+        col_config[name_col] = _TEXT_PINNED
+    for c in RATE_STAT_COLS:
+        if c in view_cols:
+            col_config[c] = _NUM2
     avg_fantasy_ppm_cols = [
         "Average Fantasy Points per Match",
         "Average Fantasy Points",
@@ -695,20 +1195,319 @@ def render_player_stats_ui(
         "Ave Points Per Match",
     ]
     for c in avg_fantasy_ppm_cols:
-        if c in view.columns:
-            col_config[c] = st.column_config.NumberColumn(format="%.2f")
-    if "Fantasy Points" in view.columns:
-        col_config["Fantasy Points"] = st.column_config.NumberColumn()
+        if c in view_cols:
+            col_config[c] = _NUM2
+    if "Fantasy Points" in view_cols:
+        col_config["Fantasy Points"] = _NUM_PLAIN
 
-    st.data_editor(
+    st.dataframe(
         view,
         width="stretch",
         hide_index=True,
-        disabled=True,
         column_config=col_config,
     )
 
 
+TEAM_SUM_COLS = [
+    "Runs Scored",
+    "Balls Faced",
+    "6s",
+    "Retirements",
+    "Innings Played",
+    "Not Out's",
+    "Total Overs",
+    "Overs",
+    "Balls Bowled",
+    "Maidens",
+    "Runs Conceded",
+    "Wickets",
+    "Wides",
+    "No Balls",
+    "Catches",
+    "Run Outs",
+    "Stumpings",
+    "Fantasy Points",
+]
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _prep_teams(teams_df: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, str], list[str]]:
+    """
+    Clean Teams_Table once per data load, build the TeamID -> team name map and the
+    case-insensitively sorted team names for the Team selectbox.
+    """
+    teams = teams_df.copy()
+    teams.columns = [str(c).strip() for c in teams.columns]
+
+    team_id_col = _find_col(teams, ["TeamID", "Team Id", "Team ID"])
+    team_name_col = _find_col(teams, ["Team Names", "Team Name"])
+    active_col = _find_col(teams, ["Active"])
+    captain_name_col = _find_col(teams, ["Captain's Name", "Captains Name", "Captain Name"])
+
+    # One StringDtype conversion over all key columns; blanks stay <NA> instead of "nan",
+    # so downstream code can compare directly.
+    str_cols = list(dict.fromkeys(c for c in (team_name_col, team_id_col, active_col, captain_name_col) if c))
+    if str_cols:
+        teams[str_cols] = teams[str_cols].astype("string").apply(lambda col: col.str.strip())
+
+    team_id_to_name, _ = _team_id_maps(teams_df)
+
+    # Few distinct names, looked up on every rerun: compare category codes instead of strings.
+    team_names: list[str] = []
+    if team_name_col:
+        teams[team_name_col] = teams[team_name_col].astype("category")
+        team_names = sorted((t for t in teams[team_name_col].cat.categories if t != ""), key=str.lower)
+
+    return teams, team_id_to_name, team_names
+
+
+def _category_mask(values: pd.Series, label: str) -> pd.Series:
+    cat = values.cat
+    if label not in cat.categories:
+        return pd.Series(False, index=values.index)
+    return cat.codes == cat.categories.get_loc(label)
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _prep_league_team_totals(league_df: pd.DataFrame, team_id_to_name: dict[str, str]) -> pd.DataFrame | None:
+    """
+    Aggregate League_Data to one row per team with derived rate metrics.
+    Returns None when TeamID cannot be mapped and an empty frame when no rows map to a team.
+    """
+    # Headers are stripped by the loader; copy only TeamID and the summed stat columns.
+    team_id_col_league = _find_col(league_df, ["TeamID", "Team Id", "Team ID"])
+    if not team_id_col_league or not team_id_to_name:
+        return None
+
+    league = league_df.loc[:, [team_id_col_league] + _present_cols(TEAM_SUM_COLS, league_df)].copy()
+    league[team_id_col_league] = league[team_id_col_league].astype("string").str.strip()
+    league["Team"] = _map_team_names(league[team_id_col_league], team_id_to_name)
+
+    league = league[league["Team"].notna() & (league["Team"] != "")]
+    if league.empty:
+        return pd.DataFrame()
+
+    _coerce_numeric(league, TEAM_SUM_COLS)
+
+    # Few distinct teams, many rows: group on category codes and leave ordering to the League Table sort.
+    league["Team"] = league["Team"].astype("category")
+    agg_map = {c: "sum" for c in TEAM_SUM_COLS if c in league.columns}
+    team_totals = (
+        league.groupby("Team", as_index=False, observed=True, sort=False).agg(agg_map)
+        if agg_map
+        else league[["Team"]].drop_duplicates()
+    )
+
+    # Derived metrics (same column names as player stats where possible).
+    # One masked np.divide per metric; a zero/blank denominator leaves NaN.
+    def _col(name: str) -> np.ndarray:
+        return pd.to_numeric(team_totals[name], errors="coerce").to_numpy(dtype=float)
+
+    def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+        out = np.full(num.shape, np.nan)
+        np.divide(num, den, out=out, where=den > 0)
+        return out
+
+    cols = team_totals.columns
+    if "Runs Scored" in cols and "Balls Faced" in cols:
+        team_totals["Batting Strike Rate"] = _ratio(_col("Runs Scored"), _col("Balls Faced")) * 100
+
+    if "Runs Scored" in cols and "Innings Played" in cols and "Not Out's" in cols:
+        # No dismissals counts as one, so the average falls back to runs scored.
+        outs = _col("Innings Played") - _col("Not Out's")
+        team_totals["Batting Average"] = _col("Runs Scored") / np.where(outs > 0, outs, 1)
+
+    if "Runs Conceded" in cols and "Overs" in cols:
+        team_totals["Economy"] = _ratio(_col("Runs Conceded"), _col("Overs"))
+
+    if "Balls Bowled" in cols and "Wickets" in cols:
+        team_totals["Bowling Strike Rate"] = _ratio(_col("Balls Bowled"), _col("Wickets"))
+
+    if "Runs Conceded" in cols and "Wickets" in cols:
+        team_totals["Bowling Average"] = _ratio(_col("Runs Conceded"), _col("Wickets"))
+
+    return team_totals
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _team_row_positions(league_df: pd.DataFrame, team_id_col_league: str) -> dict[str, np.ndarray]:
+    """
+    Stripped TeamID -> row positions in League_Data, built in one pass per data load
+    so switching teams does not re-strip and re-scan every row.
+    """
+    ids = league_df[team_id_col_league].astype("string").str.strip()
+    return ids.groupby(ids, sort=False).indices
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _prep_single_team_frame(
+    league_df: pd.DataFrame,
+    selected_team_id: str,
+    team_id_col_league: str,
+) -> pd.DataFrame:
+    """
+    Return League_Data rows for one team with the stat columns coerced to numbers.
+    """
+    # Take only this team's rows (by position) and the columns the team view can show
+    # (name, TeamID, stats) before copying; headers are already stripped by the loader.
+    positions = _team_row_positions(league_df, team_id_col_league).get(selected_team_id, np.array([], dtype=np.intp))
+    keep = _present_cols(["Name", team_id_col_league, *PLAYER_STATS_NUMERIC_COLS, "Best Figures"], league_df)
+    filtered_team = league_df.iloc[positions][keep].copy()
+    filtered_team[team_id_col_league] = selected_team_id
+
+    _coerce_numeric(filtered_team, PLAYER_STATS_NUMERIC_COLS)
+
+    return filtered_team
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _team_form_last_n_by_team(fixtures_df: pd.DataFrame, team_names: tuple[str, ...], n: int = 5) -> dict[str, str]:
+    """
+    Build the form guide (last N completed matches, most recent first) for each team.
+    Uses Fixture_Results_Table columns: Date, Time, Home Team, Away Team, Status, Won By.
+    """
+    if fixtures_df is None or fixtures_df.empty:
+        return {}
+
+    required = ["Date", "Time", "Home Team", "Away Team", "Status", "Won By"]
+    if not all(c in fixtures_df.columns for c in required):
+        return {}
+    f_all = fixtures_df[required].copy()
+
+    # Sort by Date+Time (most recent first) and keep only completed matches
+    dt = pd.to_datetime(f_all["Date"], errors="coerce")
+    raw_tm = f_all["Time"].astype(str).str.strip()
+    tm = _parse_time_of_day(raw_tm)
+    # Free-form times ("7pm", "7:30pm", "19.30") miss the exact formats; give the rest one
+    # per-element dateutil pass so same-day fixtures still sort by kick-off.
+    missing = tm.isna() & raw_tm.notna()
+    if missing.any():
+        loose = raw_tm[missing].str.replace(r"^(\d{1,2})\.(\d{2})\b", r"\1:\2", regex=True)
+        tm[missing] = pd.to_datetime("2000-01-01 " + loose, format="mixed", errors="coerce")
+    f_all["_dt"] = dt.dt.normalize() + (tm - tm.dt.normalize())
+    f_all = f_all.sort_values("_dt", ascending=False)
+    f_all = f_all[f_all["Status"].astype(str).str.strip().isin(["Played", "Abandoned"])]
+
+    # Stripped once into plain arrays; each team below is then a single numpy compare.
+    home = f_all["Home Team"].astype(str).str.strip().to_numpy()
+    away = f_all["Away Team"].astype(str).str.strip().to_numpy()
+
+    form: dict[str, str] = {}
+    for team_name in team_names:
+        team_key = str(team_name).strip()
+        f = f_all[(home == team_key) | (away == team_key)].head(n)
+
+        out = []
+        team_s = team_key.lower()
+
+        for _, r in f.iterrows():
+            status = str(r.get("Status", "")).strip()
+            won_by = str(r.get("Won By", "")).strip().lower()
+
+            # Abandoned is always a dash in the form guide
+            if status == "Abandoned":
+                out.append("➖")
+                continue
+
+            # Played: decide W/L if possible, else dash
+            if won_by and team_s in won_by:
+                out.append("✅")
+            elif won_by:
+                out.append("❌")
+            else:
+                out.append("➖")
+
+        form[team_name] = " ".join(out)
+
+    return form
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=4)
+def _prepare_team_totals(
+    teams_df: pd.DataFrame,
+    league_df: pd.DataFrame,
+    fixtures_df: pd.DataFrame,
+    team_order: tuple[str, ...],
+) -> tuple[pd.DataFrame | None, list[str]]:
+    """
+    Build the All Teams frame: team totals joined with Active and the last-5 form guide,
+    ordered like the League Table (team_order). Returns (frame, meta columns added);
+    the frame is None/empty under the same conditions as _prep_league_team_totals.
+    """
+    teams, team_id_to_name, _ = _prep_teams(teams_df)
+    team_totals = _prep_league_team_totals(league_df, team_id_to_name)
+    if team_totals is None or team_totals.empty:
+        return team_totals, []
+
+    # Join Active (optional)
+    team_name_col = _find_col(teams, ["Team Names", "Team Name"])
+    active_col = _find_col(teams, ["Active"])
+    teams_named = teams.rename(columns={team_name_col: "Team"})
+
+    meta_cols: list[str] = []
+    if active_col and active_col in teams_named.columns:
+        meta_cols.append(active_col)
+
+    tmeta = teams_named[["Team"] + meta_cols].drop_duplicates()
+    team_totals = team_totals.merge(tmeta, on="Team", how="left")
+
+    # ---- Form (Last 5) from Fixture_Results_Table ----
+    team_labels = team_totals["Team"].astype(str)
+    form_by_team = _team_form_last_n_by_team(fixtures_df, tuple(team_labels), 5)
+    team_totals["Form (Last 5)"] = team_labels.map(form_by_team).fillna("")
+
+    # First League Table position per team; teams missing from the table go last.
+    if team_order:
+        order: dict[str, int] = {}
+        for i, name in enumerate(team_order):
+            order.setdefault(name, i)
+        team_totals = (
+            team_totals.assign(__order=team_labels.map(order))
+            .sort_values("__order", ascending=True, na_position="last", kind="stable")
+            .drop(columns=["__order"])
+        )
+
+    return team_totals, meta_cols
+
+
+LT_HIDDEN_COLS = [
+    "Runs Scored",
+    "Runs Conceeded",
+    "Wickets Taken",
+    "Wickets Lost",
+    "Overs Faced",
+    "Overs Bowled",
+]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _render_league_table_html(league_table: pd.DataFrame) -> str:
+    """
+    Build the League Table <table> HTML (hidden columns dropped, Position added, NRR to 2dp).
+    Cached on the table contents so tab switches reuse the rendered string.
+    """
+    lt = league_table.drop(columns=[c for c in LT_HIDDEN_COLS if c in league_table.columns], errors="ignore")
+
+    lt.insert(0, "Position", range(1, len(lt) + 1))
+
+    if "NRR" in lt.columns:
+        nrr = pd.to_numeric(lt["NRR"], errors="coerce")
+        lt["NRR"] = np.where(nrr.notna(), np.char.mod("%.2f", nrr.fillna(0).to_numpy(dtype=float)), "")
+
+    # Numeric cells (and the formatted NRR) never need escaping: escape only the text columns,
+    # once per distinct value for categoricals, and render the rest as-is.
+    text_cols = lt.select_dtypes(include=["object", "string", "category"]).columns.drop("NRR", errors="ignore")
+    for col in text_cols:
+        values = lt[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            lt[col] = values.cat.rename_categories(lambda c: html.escape(str(c)))
+        else:
+            lt[col] = values.map(lambda v: html.escape(v) if isinstance(v, str) else v)
+    lt.columns = [html.escape(str(c)) for c in lt.columns]
+
+    return lt.to_html(index=False, escape=False)
+
+
 # ---- Read secrets ----
 try:
     app_key = _get_secret("DROPBOX_APP_KEY")
@@ -722,21 +1521,22 @@ except Exception as e:
 # ---- Load workbook from Dropbox ----
 with st.spinner("Loading latest league workbook from Dropbox..."):
     try:
-        workbook_bytes = _download_workbook_bytes(app_key, app_secret, refresh_token, dropbox_path)
-        data = load_league_workbook_from_bytes(workbook_bytes)
+        workbook_bytes, data = _load_from_dropbox(app_key, app_secret, refresh_token, dropbox_path)
     except Exception as e:
         st.error(f"Failed to load workbook from Dropbox: {e}")
         st.stop()
 
 # ---- Fixtures ----
-fixtures = data.fixture_results.copy()
-fixtures.columns = [str(c).strip() for c in fixtures.columns]
+# Headers are already stripped by the workbook loader; the frame is shared, so tabs copy before mutating.
+fixtures = data.fixture_results
 
 # ---- League table (pre-calculated in Excel) ----
 league_table_df = getattr(data, "league_table", None)
 if league_table_df is not None and not league_table_df.empty:
     league_table = league_table_df.copy()
     league_table.columns = [str(c).strip() for c in league_table.columns]
+    if "Team" in league_table.columns:
+        league_table["Team"] = league_table["Team"].astype("string").str.strip().astype("category")
 else:
     league_table = pd.DataFrame()
 
@@ -758,119 +1558,8 @@ selected_tab = st.radio(
     label_visibility="collapsed",
 )
 
-st.markdown(
-    """
-    <style>
-    /* =========================================================
-       Stateful tabs built from st.radio (native Streamlit look)
-       ========================================================= */
-
-    /* --- Radiogroup container (acts like tab bar) --- */
-    div[role="radiogroup"] {
-        display: flex !important;
-        flex-direction: row !important;
-        gap: 1.25rem !important;
-        border-bottom: none !important;      /* no separator line */
-        padding-bottom: 0 !important;
-        margin-bottom: 1.25rem;
-    }
-
-    /* --- Each tab label --- */
-    div[role="radiogroup"] > label {
-        display: inline-flex !important;
-        align-items: center !important;
-        margin: 0 !important;
-        padding: 0.45rem 0 !important;
-        cursor: pointer !important;
-        background: transparent !important;
-        border: none !important;
-        gap: 0 !important;
-
-        /* Underline support (prevents layout quirks) */
-        border-bottom: 2px solid transparent !important;
-        text-decoration: none !important;
-    }
-
-    /* --- Hide radio controls ONLY (keep labels visible) --- */
-    div[role="radiogroup"] > label > div:first-child,
-    div[role="radiogroup"] > label > span:first-child {
-        display: none !important;
-        width: 0 !important;
-        height: 0 !important;
-        margin: 0 !important;
-        padding: 0 !important;
-    }
-
-    div[role="radiogroup"] > label svg {
-        display: none !important;
-        width: 0 !important;
-        height: 0 !important;
-    }
-
-    div[role="radiogroup"] input[type="radio"] {
-        position: absolute !important;
-        opacity: 0 !important;
-        width: 0 !important;
-        height: 0 !important;
-        pointer-events: none !important;
-    }
-
-    /* --- Tab text container (Streamlit varies between div/span) --- */
-    div[role="radiogroup"] > label > div,
-    div[role="radiogroup"] > label > span {
-        padding: 0 !important;
-        font-weight: 500 !important;
-        color: rgba(49, 51, 63, 0.75) !important;   /* unselected (light) */
-    }
-
-    /* Hover (light mode) */
-    div[role="radiogroup"] > label:hover > div,
-    div[role="radiogroup"] > label:hover > span {
-        color: rgba(49, 51, 63, 1) !important;
-    }
-
-    /* Selected tab (light mode): underline + red text */
-    div[role="radiogroup"] > label:has(input:checked) {
-        border-bottom-color: rgba(255, 0, 0, 0.85) !important;
-    }
-
-    div[role="radiogroup"] > label:has(input:checked) > div,
-    div[role="radiogroup"] > label:has(input:checked) > span {
-        font-weight: 600 !important;
-        color: rgba(255, 0, 0, 0.85) !important;    /* selected red */
-    }
-
-    /* =========================================================
-       Dark mode: unselected white, selected red, underline red
-       ========================================================= */
-    @media (prefers-color-scheme: dark) {
-
-        /* Unselected */
-        div[role="radiogroup"] > label > div,
-        div[role="radiogroup"] > label > span {
-            color: rgba(255, 255, 255, 0.90) !important;
-        }
-
-        /* Hover */
-        div[role="radiogroup"] > label:hover > div,
-        div[role="radiogroup"] > label:hover > span {
-            color: rgba(255, 255, 255, 1) !important;
-        }
-
-        /* Selected */
-        div[role="radiogroup"] > label:has(input:checked) {
-            border-bottom-color: rgba(255, 0, 0, 0.90) !important;
-        }
-
-        div[role="radiogroup"] > label:has(input:checked) > div,
-        div[role="radiogroup"] > label:has(input:checked) > span {
-            color: rgba(255, 0, 0, 0.90) !important;
-        }
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Static CSS string is defined once; Streamlit needs it emitted on every run to keep it applied.
+st.markdown(_TABS_CSS, unsafe_allow_html=True)
 
 # ============================
 # TAB: TOP PERFORMERS
@@ -891,18 +1580,14 @@ if selected_tab == "Top Performers":
 if selected_tab == "Fixtures & Results":
     st.subheader("Fixtures & Results")
 
-    display = fixtures.copy()
-
-    if "Date" in display.columns:
-        display["Date"] = _format_date_dd_mmm(display["Date"])
-    if "Time" in display.columns:
-        display["Time"] = _format_time_ampm(display["Time"])
+    display = _format_fixture_datetimes(fixtures)
 
     ordered_cols = ["Date", "Time", "Home Team", "Away Team", "Status", "Won By", "Home Score", "Away Score"]
     show_cols = [c for c in ordered_cols if c in display.columns]
+    display = display.reindex(columns=show_cols or display.columns)
 
     st.dataframe(
-        display[show_cols] if show_cols else display,
+        display,
         width="stretch",
         hide_index=True,
     )
@@ -919,133 +1604,9 @@ if selected_tab == "League Table":
             "on sheet 'Fixture_Results' and that it contains at least one data row."
         )
     else:
-        lt = league_table.copy()
-
-        cols_to_hide = [
-            "Runs Scored",
-            "Runs Conceeded",
-            "Wickets Taken",
-            "Wickets Lost",
-            "Overs Faced",
-            "Overs Bowled",
-        ]
-        lt = lt.drop(columns=[c for c in cols_to_hide if c in lt.columns], errors="ignore")
-
-        lt.insert(0, "Position", range(1, len(lt) + 1))
-
-        if "NRR" in lt.columns:
-            nrr = pd.to_numeric(lt["NRR"], errors="coerce")
-            lt["NRR"] = nrr.map(lambda x: f"{x:.2f}" if pd.notna(x) else "")
-
-        html_table = lt.to_html(index=False, escape=True)
-
-        st.markdown(
-            """
-            <style>
-                .lt-wrap {
-                width: 100%;
-                border: 1px solid rgba(49, 51, 63, 0.15);
-                border-radius: 0.5rem;
-                overflow: hidden;
-                background: white;
-                padding-bottom: 0;
-              }
-
-                .lt-scroll {
-                width: 100%;
-                overflow-x: auto;
-                overflow-y: hidden;
-              }
-
-                .lt-wrap table {
-                width: 100%;
-                border-collapse: separate;
-                border-spacing: 0;
-                font-size: 0.95rem;
-                border-top: none !important;
-                border-bottom: none !important;
-                margin: 0 !important;
-                padding: 0 !important;
-              }
-
-                .lt-wrap thead th {
-                position: sticky;
-                top: 0;
-                z-index: 2;
-                background: rgba(250, 250, 252, 1);
-                color: rgba(49, 51, 63, 0.9);
-                text-align: left;
-                font-weight: 600;
-                padding: 0.65rem 0.75rem;
-                border-bottom: 1px solid rgba(49, 51, 63, 0.15);
-                white-space: nowrap;
-              }
-
-                .lt-wrap tbody td {
-                padding: 0.6rem 0.75rem;
-                border-bottom: 1px solid rgba(49, 51, 63, 0.08);
-                color: rgba(49, 51, 63, 0.95);
-                white-space: nowrap;
-              }
-
-                .lt-wrap tbody td:not(:nth-child(2)),
-                .lt-wrap thead th:not(:nth-child(2)) {
-                text-align: center;
-              }
-
-                .lt-wrap tbody tr:nth-child(1) td { background: rgba(255, 215, 0, 0.08); }
-                .lt-wrap tbody tr:nth-child(2) td { background: rgba(192, 192, 192, 0.22); }
-                .lt-wrap tbody tr:nth-child(3) td { background: rgba(205, 127, 50, 0.10); }
-
-                .lt-wrap tbody tr:last-child td { border-bottom: 1px solid transparent; }
-
-                .lt-wrap tbody tr:hover td { background: rgba(240, 242, 246, 1); }
-
-                .lt-wrap table, .lt-wrap th, .lt-wrap td {
-                border-left: none !important;
-                border-right: none !important;
-              }
-
-            @media (prefers-color-scheme: dark) {
-
-                .lt-wrap {
-                    background: rgba(14, 17, 23, 1) !important;
-                    border: 1px solid rgba(255, 255, 255, 0.12) !important;
-                }
-
-                .lt-wrap table {
-                    background: transparent !important;
-                }
-
-                .lt-wrap thead th {
-                    background: rgba(28, 31, 38, 1) !important;
-                    color: rgba(255, 255, 255, 0.90) !important;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.12) !important;
-                }
-
-                .lt-wrap tbody td {
-                    color: rgba(255, 255, 255, 0.88) !important;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.08) !important;
-                }
-
-                .lt-wrap tbody tr:hover td {
-                    background: rgba(255, 255, 255, 0.06) !important;
-                }
-
-                .lt-wrap tbody tr:nth-child(1) td { background: rgba(255, 215, 0, 0.10) !important; }
-                .lt-wrap tbody tr:nth-child(2) td { background: rgba(192, 192, 192, 0.10) !important; }
-                .lt-wrap tbody tr:nth-child(3) td { background: rgba(205, 127, 50, 0.10) !important; }
-
-                .lt-wrap table, .lt-wrap th, .lt-wrap td {
-                    border-left: none !important;
-                    border-right: none !important;
-                }
-            }
+        html_table = _render_league_table_html(league_table)
 
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_LT_CSS, unsafe_allow_html=True)
 
         st.markdown(
             f"""
@@ -1072,8 +1633,7 @@ if selected_tab == "Teams":
         st.info("No Teams_Table found yet.")
         st.stop()
 
-    teams = teams_df.copy()
-    teams.columns = [str(c).strip() for c in teams.columns]
+    teams, _, team_names = _prep_teams(teams_df)
 
     team_id_col = _find_col(teams, ["TeamID", "Team Id", "Team ID"])
     team_name_col = _find_col(teams, ["Team Names", "Team Name"])
@@ -1084,18 +1644,6 @@ if selected_tab == "Teams":
         st.error("Teams_Table is missing 'Team Names'.")
         st.stop()
 
-    teams[team_name_col] = teams[team_name_col].astype(str).str.strip()
-    if team_id_col and team_id_col in teams.columns:
-        teams[team_id_col] = teams[team_id_col].astype(str).str.strip()
-    if active_col and active_col in teams.columns:
-        teams[active_col] = teams[active_col].astype(str).str.strip()
-    if captain_name_col and captain_name_col in teams.columns:
-        teams[captain_name_col] = teams[captain_name_col].astype(str).str.strip()
-
-    team_names = sorted(
-        [t for t in teams[team_name_col].dropna().unique().tolist() if str(t).strip() != ""],
-        key=str.lower,
-    )
     team_choice = st.selectbox("Team", ["All Teams"] + team_names, key="ts_team_name")
 
     # ---------------------------------------------------------
@@ -1107,200 +1655,25 @@ if selected_tab == "Teams":
             st.info("No League_Data_Stats found yet, so team totals cannot be calculated.")
             st.stop()
 
-        league = league_df.copy()
-        league.columns = [str(c).strip() for c in league.columns]
-
-        team_id_col_league = _find_col(league, ["TeamID", "Team Id", "Team ID"])
-
-        team_id_to_name: dict[str, str] = {}
-        if team_id_col and team_id_col in teams.columns:
-            tmap = teams[[team_id_col, team_name_col]].copy()
-            tmap[team_id_col] = tmap[team_id_col].astype(str).str.strip()
-            tmap[team_name_col] = tmap[team_name_col].astype(str).str.strip()
-            tmap = tmap[(tmap[team_id_col] != "") & (tmap[team_name_col] != "")].drop_duplicates()
-            team_id_to_name = dict(zip(tmap[team_id_col], tmap[team_name_col]))
-
-        if not team_id_col_league or team_id_col_league not in league.columns or not team_id_to_name:
+        # Sort All Teams to match league_table order (as sorted in Excel)
+        team_order = tuple(league_table["Team"].astype(str)) if "Team" in league_table.columns else ()
+        team_totals, meta_cols = _prepare_team_totals(teams_df, league_df, fixtures, team_order)
+        if team_totals is None:
             st.info("Team totals require TeamID in League_Data and TeamID/Team Names in Teams_Table.")
             st.stop()
-
-        league[team_id_col_league] = league[team_id_col_league].astype(str).str.strip()
-        league["Team"] = league[team_id_col_league].map(team_id_to_name)
-
-        league = league[league["Team"].notna() & (league["Team"].astype(str).str.strip() != "")]
-        if league.empty:
+        if team_totals.empty:
             st.info("No mapped team stats available yet.")
             st.stop()
-
-        sum_cols = [
-            "Runs Scored",
-            "Balls Faced",
-            "6s",
-            "Retirements",
-            "Innings Played",
-            "Not Out's",
-            "Total Overs",
-            "Overs",
-            "Balls Bowled",
-            "Maidens",
-            "Runs Conceded",
-            "Wickets",
-            "Wides",
-            "No Balls",
-            "Catches",
-            "Run Outs",
-            "Stumpings",
-            "Fantasy Points",
-        ]
-        for c in sum_cols:
-            if c in league.columns:
-                league[c] = pd.to_numeric(league[c], errors="coerce")
-
-        agg_map = {c: "sum" for c in sum_cols if c in league.columns}
-        team_totals = league.groupby("Team", as_index=False).agg(agg_map) if agg_map else league[["Team"]].drop_duplicates()
-
-        # Derived metrics (same column names as player stats where possible)
-        if "Runs Scored" in team_totals.columns and "Balls Faced" in team_totals.columns:
-            rs = pd.to_numeric(team_totals["Runs Scored"], errors="coerce")
-            bf = pd.to_numeric(team_totals["Balls Faced"], errors="coerce")
-            team_totals["Batting Strike Rate"] = (rs / bf) * 100
-            team_totals.loc[(bf.isna()) | (bf <= 0), "Batting Strike Rate"] = pd.NA
-
-        if "Runs Scored" in team_totals.columns and "Innings Played" in team_totals.columns and "Not Out's" in team_totals.columns:
-            rs = pd.to_numeric(team_totals["Runs Scored"], errors="coerce")
-            inn = pd.to_numeric(team_totals["Innings Played"], errors="coerce")
-            no = pd.to_numeric(team_totals["Not Out's"], errors="coerce")
-            outs = inn - no
-            outs = outs.where((outs.notna()) & (outs > 0), 1)
-            team_totals["Batting Average"] = rs / outs
-            team_totals.loc[rs.isna(), "Batting Average"] = pd.NA
-
-        if "Runs Conceded" in team_totals.columns and "Overs" in team_totals.columns:
-            rc = pd.to_numeric(team_totals["Runs Conceded"], errors="coerce")
-            ov = pd.to_numeric(team_totals["Overs"], errors="coerce")
-            team_totals["Economy"] = rc / ov
-            team_totals.loc[(ov.isna()) | (ov <= 0), "Economy"] = pd.NA
-
-        if "Balls Bowled" in team_totals.columns and "Wickets" in team_totals.columns:
-            bb = pd.to_numeric(team_totals["Balls Bowled"], errors="coerce")
-            wk = pd.to_numeric(team_totals["Wickets"], errors="coerce")
-            team_totals["Bowling Strike Rate"] = bb / wk
-            team_totals.loc[(wk.isna()) | (wk <= 0), "Bowling Strike Rate"] = pd.NA
-
-        if "Runs Conceded" in team_totals.columns and "Wickets" in team_totals.columns:
-            rc = pd.to_numeric(team_totals["Runs Conceded"], errors="coerce")
-            wk = pd.to_numeric(team_totals["Wickets"], errors="coerce")
-            team_totals["Bowling Average"] = rc / wk
-            team_totals.loc[(wk.isna()) | (wk <= 0), "Bowling Average"] = pd.NA
-
-        # Join Active + Captain (optional)
-        teams_named = teams.rename(columns={team_name_col: "Team"}).copy()
-        teams_named["Team"] = teams_named["Team"].astype(str).str.strip()
-
-        meta_cols: list[str] = []
-        if active_col and active_col in teams_named.columns:
-            meta_cols.append(active_col)
-
-        tmeta = teams_named[["Team"] + meta_cols].drop_duplicates() if meta_cols else teams_named[["Team"]].drop_duplicates()
-        team_totals = team_totals.merge(tmeta, on="Team", how="left")
-
-        # ---- Form (Last 5) from Fixture_Results_Table ----
-        # Uses: fixtures (already loaded at top), columns: Date, Time, Home Team, Away Team, Status, Won By
-        def _team_form_last_n(team_name: str, n: int = 5) -> str:
-            if fixtures is None or fixtures.empty:
-                return ""
-
-            f = fixtures.copy()
-            f.columns = [str(c).strip() for c in f.columns]
-
-            required = ["Date", "Time", "Home Team", "Away Team", "Status", "Won By"]
-            if not all(c in f.columns for c in required):
-                return ""
-
-            # Only matches involving this team
-            f = f[
-                (f["Home Team"].astype(str).str.strip() == str(team_name).strip())
-                | (f["Away Team"].astype(str).str.strip() == str(team_name).strip())
-            ].copy()
-
-            if f.empty:
-                return ""
-
-            # Sort by Date+Time (most recent first)
-            dt = pd.to_datetime(f["Date"], errors="coerce")
-            tm = pd.to_datetime("2000-01-01 " + f["Time"].astype(str), errors="coerce").dt.time
-            f["_dt"] = pd.to_datetime(dt.dt.date.astype(str) + " " + tm.astype(str), errors="coerce")
-            f = f.sort_values("_dt", ascending=False)
-
-            # Keep only completed matches
-            f = f[f["Status"].astype(str).str.strip().isin(["Played", "Abandoned"])].copy()
-
-            # If no completed matches, show nothing
-            if f.empty:
-                return ""
-
-            # Take up to last N completed matches (most recent N)
-            f = f.head(n)
-
-            out = []
-            team_s = str(team_name).strip().lower()
-
-            for _, r in f.iterrows():
-                status = str(r.get("Status", "")).strip()
-                won_by = str(r.get("Won By", "")).strip().lower()
-
-                # Abandoned is always a dash in the form guide
-                if status == "Abandoned":
-                    out.append("➖")
-                    continue
-
-                # Played: decide W/L if possible, else dash
-                if won_by and team_s in won_by:
-                    out.append("✅")
-                elif won_by:
-                    out.append("❌")
-                else:
-                    out.append("➖")
-
-            return " ".join(out)
-
-        # Compute form per team
-        team_totals["Form (Last 5)"] = team_totals["Team"].apply(lambda t: _team_form_last_n(t, 5))
-
-        # ---- Sort All Teams to match league_table order (as sorted in Excel) ----
-        # Requires league_table to contain a Team column with the same labels as team_totals["Team"]
-        if "Team" in league_table.columns and not league_table.empty:
-            _order_df = league_table[["Team"]].copy()
-            _order_df["__order"] = range(len(_order_df))
-            team_totals = team_totals.merge(_order_df, on="Team", how="left")
-            team_totals = team_totals.sort_values("__order", ascending=True, na_position="last").drop(columns=["__order"])
+        tt_cols = set(team_totals.columns)
 
         # ---- selectors (Batting / Bowling / Fielding) ----
-        TEAM_BATTING_STATS = [
-            "Runs Scored",
-            "Balls Faced",
-            "6s",
-            "Retirements",
-            "Batting Strike Rate",
-            "Batting Average",
-        ]
-        TEAM_BOWLING_STATS = [
-            "Overs",
-            "Balls Bowled",
-            "Maidens",
-            "Runs Conceded",
-            "Wickets",
-            "Wides",
-            "No Balls",
-            "Economy",
-            "Bowling Strike Rate",
-            "Bowling Average",
-        ]
-        TEAM_FIELDING_STATS = ["Catches", "Run Outs", "Stumpings"]
-
-        batting_options = [c for c in TEAM_BATTING_STATS if c in team_totals.columns]
-        bowling_options = [c for c in TEAM_BOWLING_STATS if c in team_totals.columns]
-        fielding_options = [c for c in TEAM_FIELDING_STATS if c in team_totals.columns]
+        team_options: dict[str, list[str]] = {"batting": [], "bowling": [], "fielding": []}
+        for stat, group in TEAM_STAT_GROUPS.items():
+            if stat in tt_cols:
+                team_options[group].append(stat)
+        batting_options = team_options["batting"]
+        bowling_options = team_options["bowling"]
+        fielding_options = team_options["fielding"]
 
         default_batting = [c for c in ["Runs Scored", "Batting Average"] if c in batting_options]
         default_bowling = [c for c in ["Wickets", "Economy"] if c in bowling_options]
@@ -1321,38 +1694,28 @@ if selected_tab == "Teams":
 
         selected_columns = selected_batting + selected_bowling + selected_fielding
 
-        # Build columns: Team + Form + meta + selected + Fantasy Points (Fantasy Points last)
-        display_cols = ["Team"]
-        if "Form (Last 5)" in team_totals.columns:
-            display_cols.append("Form (Last 5)")
-
-        for mc in meta_cols:
-            if mc in team_totals.columns and mc not in display_cols:
-                display_cols.append(mc)
-
-        for c in selected_columns:
-            if c in team_totals.columns and c not in display_cols:
-                display_cols.append(c)
-
-        if "Fantasy Points" in team_totals.columns and "Fantasy Points" not in display_cols:
-            display_cols.append("Fantasy Points")
+        # Build columns: Team + Form + meta + selected + Fantasy Points (Fantasy Points last).
+        # dict.fromkeys dedupes in one pass, keeping each column at its first position.
+        wanted = ["Team", "Form (Last 5)", *meta_cols, *selected_columns, "Fantasy Points"]
+        display_cols = [c for c in dict.fromkeys(wanted) if c in tt_cols]
 
-        view = team_totals[display_cols].copy() if all(c in team_totals.columns for c in display_cols) else team_totals.copy()
+        # Read-only slice for rendering; no copy needed.
+        view = team_totals.loc[:, _present_cols(display_cols, team_totals) or list(team_totals.columns)]
+        view_cols = set(view.columns)
 
-        col_config = {"Team": st.column_config.TextColumn(pinned=True)}
-        for c in ["Batting Strike Rate", "Batting Average", "Economy", "Bowling Strike Rate", "Bowling Average"]:
-            if c in view.columns:
-                col_config[c] = st.column_config.NumberColumn(format="%.2f")
+        col_config = {"Team": _TEXT_PINNED}
+        for c in RATE_STAT_COLS:
+            if c in view_cols:
+                col_config[c] = _NUM2
 
         # Do not pin Fantasy Points (ensures it stays far right)
-        if "Fantasy Points" in view.columns:
-            col_config["Fantasy Points"] = st.column_config.NumberColumn()
+        if "Fantasy Points" in view_cols:
+            col_config["Fantasy Points"] = _NUM_PLAIN
 
-        st.data_editor(
+        st.dataframe(
             view,
             width="stretch",
             hide_index=True,
-            disabled=True,
             column_config=col_config,
         )
 
@@ -1362,24 +1725,22 @@ if selected_tab == "Teams":
     # ---------------------------------------------------------
     # SINGLE TEAM VIEW
     # ---------------------------------------------------------
-    team_row = teams.loc[teams[team_name_col] == team_choice]
-    if team_row.empty:
+    team_matches = teams.index[_category_mask(teams[team_name_col], team_choice).to_numpy()]
+    if len(team_matches) == 0:
         st.info("Selected team not found in Teams_Table.")
         st.stop()
-    team_row = team_row.iloc[0]
+    team_idx = team_matches[0]
 
     meta_c1, meta_c2, meta_c3 = st.columns([2, 1, 2])
     with meta_c1:
         st.markdown(f"**Team:** {team_choice}")
     with meta_c2:
-        st.markdown(f"**Active:** {team_row.get(active_col, '—') if active_col else '—'}")
+        st.markdown(f"**Active:** {teams.at[team_idx, active_col] if active_col else '—'}")
     with meta_c3:
-        st.markdown(f"**Captain:** {team_row.get(captain_name_col, '—') if captain_name_col else '—'}")
+        st.markdown(f"**Captain:** {teams.at[team_idx, captain_name_col] if captain_name_col else '—'}")
 
     if league_table is not None and not league_table.empty and "Team" in league_table.columns:
-        lt_lookup = league_table.copy()
-        lt_lookup.columns = [str(c).strip() for c in lt_lookup.columns]
-        lt_team = lt_lookup[lt_lookup["Team"].astype(str).str.strip() == str(team_choice).strip()]
+        lt_team = league_table[_category_mask(league_table["Team"], str(team_choice).strip())]
         if not lt_team.empty:
             r = lt_team.iloc[0].to_dict()
             played = r.get("Played", "—")
@@ -1397,72 +1758,30 @@ if selected_tab == "Teams":
         st.info("No League_Data_Stats found yet, so team stats cannot be displayed.")
         st.stop()
 
-    league = league_df.copy()
-    league.columns = [str(c).strip() for c in league.columns]
-
-    name_col = _find_col(league, ["Name"])
-    team_id_col_league = _find_col(league, ["TeamID", "Team Id", "Team ID"])
+    # Workbook table headers are stripped by the loader, so columns can be resolved on league_df directly.
+    name_col = _find_col(league_df, ["Name"])
+    team_id_col_league = _find_col(league_df, ["TeamID", "Team Id", "Team ID"])
 
-    if not (team_id_col and team_id_col_league and team_id_col in teams.columns and team_id_col_league in league.columns):
+    if not (team_id_col and team_id_col_league and team_id_col in teams.columns):
         st.info("Team page requires TeamID in Teams_Table and League_Data.")
         st.stop()
 
-    selected_team_id = str(team_row.get(team_id_col, "")).strip()
+    selected_team_id = str(teams.at[team_idx, team_id_col]).strip()
     if not selected_team_id:
         st.info("Selected team has no TeamID in Teams_Table.")
         st.stop()
 
-    filtered_team = league.copy()
-    filtered_team[team_id_col_league] = filtered_team[team_id_col_league].astype(str).str.strip()
-    filtered_team = filtered_team[filtered_team[team_id_col_league] == selected_team_id]
+    filtered_team = _prep_single_team_frame(league_df, selected_team_id, team_id_col_league)
 
     if filtered_team.empty:
         st.info("No matching player stats found for this team yet.")
         st.stop()
-
-    numeric_cols = [
-        "Runs Scored", "Balls Faced", "6s", "Retirements",
-        "Batting Strike Rate", "Batting Average", "Highest Score",
-        "Innings Played", "Not Out's",
-        "Total Overs", "Overs", "Balls Bowled", "Maidens", "Runs Conceded", "Wickets",
-        "Wides", "No Balls", "Economy", "Bowling Strike Rate", "Bowling Average",
-        "Catches", "Run Outs", "Stumpings", "Fantasy Points",
-    ]
-    for c in numeric_cols:
-        if c in filtered_team.columns:
-            filtered_team[c] = pd.to_numeric(filtered_team[c], errors="coerce")
+    ft_cols = set(filtered_team.columns)
 
     # Selectors (Batting / Bowling / Fielding)
-    BATTING_STATS = [
-        "Runs Scored",
-        "Balls Faced",
-        "6s",
-        "Retirements",
-        "Batting Strike Rate",
-        "Batting Average",
-        "Highest Score",
-        "Innings Played",
-        "Not Out's",
-    ]
-    BOWLING_STATS = [
-        "Total Overs",
-        "Overs",
-        "Balls Bowled",
-        "Maidens",
-        "Runs Conceded",
-        "Wickets",
-        "Wides",
-        "No Balls",
-        "Economy",
-        "Bowling Strike Rate",
-        "Bowling Average",
-        "Best Figures",
-    ]
-    FIELDING_STATS = ["Catches", "Run Outs", "Stumpings"]
-
-    batting_options = [c for c in BATTING_STATS if c in filtered_team.columns]
-    bowling_options = [c for c in BOWLING_STATS if c in filtered_team.columns]
-    fielding_options = [c for c in FIELDING_STATS if c in filtered_team.columns]
+    batting_options = _present_cols(BATTING_STATS, filtered_team)
+    bowling_options = _present_cols(TEAM_PLAYER_BOWLING_STATS, filtered_team)
+    fielding_options = _present_cols(FIELDING_STATS, filtered_team)
 
     default_batting = [c for c in ["Runs Scored", "Batting Average"] if c in batting_options]
     default_bowling = [c for c in ["Wickets", "Economy"] if c in bowling_options]
@@ -1483,120 +1802,95 @@ if selected_tab == "Teams":
 
     selected_columns = selected_batting + selected_bowling + selected_fielding
 
-    fixed_name = "Name" if "Name" in filtered_team.columns else (name_col if name_col in filtered_team.columns else None)
+    fixed_name = "Name" if "Name" in ft_cols else (name_col if name_col in ft_cols else None)
     fixed_cols: list[str] = []
     if fixed_name:
         fixed_cols.append(fixed_name)
 
-    display_cols: list[str] = []
-    for c in fixed_cols:
-        if c in filtered_team.columns and c not in display_cols:
-            display_cols.append(c)
-
-    for c in selected_columns:
-        if c in filtered_team.columns and c not in display_cols:
-            display_cols.append(c)
-
-    if "Fantasy Points" in filtered_team.columns and "Fantasy Points" not in display_cols:
-        display_cols.append("Fantasy Points")
+    # Name + selected + Fantasy Points (last unless already selected), deduped in one pass.
+    wanted = [*fixed_cols, *selected_columns, "Fantasy Points"]
+    display_cols = [c for c in dict.fromkeys(wanted) if c in ft_cols]
 
-    player_view = filtered_team[display_cols].copy() if display_cols else filtered_team.copy()
+    # Read-only slice for rendering; no copy needed.
+    player_view = filtered_team.loc[:, display_cols] if display_cols else filtered_team
+    pv_cols = set(player_view.columns)
 
-    if "Fantasy Points" in player_view.columns:
-        try:
-            player_view = player_view.sort_values(by="Fantasy Points", ascending=False)
-        except Exception:
-            pass
-    elif "Runs Scored" in player_view.columns:
-        try:
-            player_view = player_view.sort_values(by="Runs Scored", ascending=False)
-        except Exception:
-            pass
+    sort_key = (
+        "Fantasy Points"
+        if "Fantasy Points" in pv_cols
+        else ("Runs Scored" if "Runs Scored" in pv_cols else None)
+    )
+    if sort_key:
+        player_view = _sort_desc(player_view, sort_key)
 
     col_config: dict = {}
-    if fixed_name and fixed_name in player_view.columns:
-        col_config[fixed_name] = st.column_config.TextColumn(pinned=True)
+    if fixed_name and fixed_name in pv_cols:
+        col_config[fixed_name] = _TEXT_PINNED
 
-    for c in ["Batting Strike Rate", "Batting Average", "Economy", "Bowling Strike Rate", "Bowling Average"]:
-        if c in player_view.columns:
-            col_config[c] = st.column_config.NumberColumn(format="%.2f")
+    for c in RATE_STAT_COLS:
+        if c in pv_cols:
+            col_config[c] = _NUM2
 
     # Do not pin Fantasy Points (ensures it stays far right)
-    if "Fantasy Points" in player_view.columns:
-        col_config["Fantasy Points"] = st.column_config.NumberColumn()
+    if "Fantasy Points" in pv_cols:
+        col_config["Fantasy Points"] = _NUM_PLAIN
 
     st.markdown("#### Player Stats (Team)")
-    st.data_editor(
+    st.dataframe(
         player_view,
         width="stretch",
         hide_index=True,
-        disabled=True,
         column_config=col_config,
     )
 
     # Totals table (same columns as player_view)
     st.markdown("#### Team Totals")
 
-    base = filtered_team.copy()
-
-    def _sum(col: str) -> float | None:
-        if col not in base.columns:
-            return None
-        s = pd.to_numeric(base[col], errors="coerce").fillna(0).sum()
-        return float(s)
+    # One aggregation pass over the team's numeric columns, kept column-wise so each sum
+    # stays int64/float64; derived metrics read scalars back from it.
+    totals_frame = pd.DataFrame(
+        {c: [filtered_team[c].sum()] for c in _present_cols(PLAYER_STATS_NUMERIC_COLS, filtered_team)},
+        index=[0],
+    )
+    sums: dict[str, float] = totals_frame.iloc[0].astype(float).to_dict()
+    rs = sums.get("Runs Scored", 0.0)
+    rc = sums.get("Runs Conceded", 0.0)
+    wk = sums.get("Wickets", 0.0)
 
-    totals_row: dict = {}
+    totals_df = totals_frame[[c for c in TEAM_SUM_COLS if c in sums and c in pv_cols]].copy()
     if fixed_name:
-        totals_row[fixed_name] = "Team Totals"
-
-    for col in [
-        "Runs Scored", "Balls Faced", "6s", "Retirements",
-        "Innings Played", "Not Out's",
-        "Total Overs", "Overs", "Balls Bowled", "Maidens", "Runs Conceded", "Wickets", "Wides", "No Balls",
-        "Catches", "Run Outs", "Stumpings", "Fantasy Points",
-    ]:
-        val = _sum(col)
-        if val is not None and col in player_view.columns:
-            totals_row[col] = val
-
-    if "Batting Strike Rate" in player_view.columns:
-        rs = _sum("Runs Scored") or 0.0
-        bf = _sum("Balls Faced") or 0.0
-        totals_row["Batting Strike Rate"] = (rs / bf) * 100 if bf > 0 else pd.NA
-
-    if "Batting Average" in player_view.columns:
-        rs = _sum("Runs Scored") or 0.0
-        inn = _sum("Innings Played")
-        no = _sum("Not Out's")
-        if inn is not None and no is not None:
-            outs = inn - no
+        totals_df[fixed_name] = "Team Totals"
+
+    if "Batting Strike Rate" in pv_cols:
+        bf = sums.get("Balls Faced", 0.0)
+        totals_df["Batting Strike Rate"] = (rs / bf) * 100 if bf > 0 else np.nan
+
+    if "Batting Average" in pv_cols:
+        if "Innings Played" in sums and "Not Out's" in sums:
+            outs = sums["Innings Played"] - sums["Not Out's"]
             outs = outs if outs > 0 else 1.0
-            totals_row["Batting Average"] = rs / outs
+            totals_df["Batting Average"] = rs / outs
         else:
-            totals_row["Batting Average"] = pd.NA
+            totals_df["Batting Average"] = np.nan
 
-    if "Economy" in player_view.columns:
-        rc = _sum("Runs Conceded") or 0.0
-        ov = _sum("Overs") or 0.0
-        totals_row["Economy"] = (rc / ov) if ov > 0 else pd.NA
+    if "Economy" in pv_cols:
+        ov = sums.get("Overs", 0.0)
+        totals_df["Economy"] = (rc / ov) if ov > 0 else np.nan
 
-    if "Bowling Strike Rate" in player_view.columns:
-        bb = _sum("Balls Bowled") or 0.0
-        wk = _sum("Wickets") or 0.0
-        totals_row["Bowling Strike Rate"] = (bb / wk) if wk > 0 else pd.NA
+    if "Bowling Strike Rate" in pv_cols:
+        bb = sums.get("Balls Bowled", 0.0)
+        totals_df["Bowling Strike Rate"] = (bb / wk) if wk > 0 else np.nan
 
-    if "Bowling Average" in player_view.columns:
-        rc = _sum("Runs Conceded") or 0.0
-        wk = _sum("Wickets") or 0.0
-        totals_row["Bowling Average"] = (rc / wk) if wk > 0 else pd.NA
+    if "Bowling Average" in pv_cols:
+        totals_df["Bowling Average"] = (rc / wk) if wk > 0 else np.nan
 
-    totals_df = pd.DataFrame([{c: totals_row.get(c, pd.NA) for c in player_view.columns}])
+    # Align to player_view's column order only; the sums keep their own (wider) dtypes.
+    totals_df = totals_df.reindex(columns=player_view.columns)
 
-    st.data_editor(
+    st.dataframe(
         totals_df,
         width="stretch",
         hide_index=True,
-        disabled=True,
         column_config=col_config,
     )
 # ============================
@@ -1667,57 +1961,7 @@ if selected_tab == "Scorecards":
         st.stop()
 
     # Build a friendly fixture selector (Option A)
-    fsel = fixtures.copy()
-    fsel.columns = [str(c).strip() for c in fsel.columns]
-
-    # Format date/time for display if present
-    if "Date" in fsel.columns:
-        fsel["Date"] = _format_date_dd_mmm(fsel["Date"])
-    if "Time" in fsel.columns:
-        fsel["Time"] = _format_time_ampm(fsel["Time"])
-
-    def _safe(v) -> str:
-        if pd.isna(v):
-            return ""
-        return str(v).strip()
-
-
-    # Build all fixture options
-    options: list[str] = []
-    option_to_match: dict[str, str] = {}
-
-    for _, r in fsel.iterrows():
-        mid = _safe(r.get("MatchID"))
-        if not mid:
-            continue
-
-        # Dropdown label for normal users: "01-Jan - 7 PM - Home vs Away"
-        date_txt = _safe(r.get("Date")) if "Date" in fsel.columns else ""
-
-        # Time is already formatted earlier via _format_time_ampm; reduce to "H AM/PM"
-        time_txt = _safe(r.get("Time")) if "Time" in fsel.columns else ""
-        if time_txt:
-            # Examples handled: "7:00 PM" -> "7 PM", "7 PM" -> "7 PM"
-            t = time_txt.replace(".", "").strip()
-            if ":" in t:
-                # "7:00 PM" -> ["7", "00 PM"] -> hour="7", ampm="PM"
-                hour_part = t.split(":", 1)[0].strip()
-                ampm_part = t.split(" ", 1)[-1].strip().upper()  # "PM"/"AM"
-                time_txt = f"{hour_part} {ampm_part}"
-            else:
-                # Ensure spacing/case is consistent if already "7 PM"
-                parts = t.split()
-                if len(parts) >= 2:
-                    time_txt = f"{parts[0]} {parts[-1].upper()}"
-
-        match_txt = ""
-        if "Home Team" in fsel.columns and "Away Team" in fsel.columns:
-            match_txt = f"{_safe(r.get('Home Team'))} vs {_safe(r.get('Away Team'))}"
-
-        label = " - ".join([p for p in [date_txt, time_txt, match_txt] if p])
-
-        options.append(label)
-        option_to_match[label] = mid
+    options, option_to_match = _build_fixture_options(fixtures)
 
     if not options:
         st.info("No fixtures with a valid MatchID were found.")
@@ -1726,7 +1970,7 @@ if selected_tab == "Scorecards":
     # -------------------------------------------------
     # Fast filter: one DB query for all MatchIDs that have scorecards
     # -------------------------------------------------
-    match_ids_with_scorecards = set(list_scorecard_match_ids())
+    match_ids_with_scorecards = matches_with_scorecards()
 
     filtered_options = [label for label in options if option_to_match[label] in match_ids_with_scorecards]
 
@@ -1763,6 +2007,13 @@ if selected_tab == "Scorecards":
     if image_rows:
         st.caption("Mobile (iPhone): press and hold the image to ‘Save to Photos’.")
 
+        # Prefetch every image for this fixture in one batch so Previous/Next are instant
+        image_paths = tuple(row.get("dropbox_path") for row in image_rows if row.get("dropbox_path"))
+        try:
+            image_bytes, image_errors = _download_scorecards_bytes(app_key, app_secret, refresh_token, image_paths)
+        except Exception as e:
+            image_bytes, image_errors = {}, {p: str(e) for p in image_paths}
+
         # Persistent index per match
         idx_key = f"scorecard_img_idx_{selected_match_id}"
         if idx_key not in st.session_state:
@@ -1782,12 +2033,12 @@ if selected_tab == "Scorecards":
         dbx_path = row.get("dropbox_path")
 
         if dbx_path:
-            try:
-                img_bytes = _download_scorecard_bytes(app_key, app_secret, refresh_token, dbx_path)
+            img_bytes = image_bytes.get(dbx_path)
+            if img_bytes is not None:
                 st.markdown(f"**{fname}**")
                 st.image(img_bytes, width="stretch")
-            except Exception as e:
-                st.warning(f"Could not load image '{fname}': {e}")
+            else:
+                st.warning(f"Could not load image '{fname}': {image_errors.get(dbx_path, 'unknown error')}")
 
         # Image position indicator directly under the image
         st.caption(f"Image {idx + 1} of {n}")
@@ -1826,19 +2077,24 @@ if selected_tab == "Scorecards":
         st.markdown("#### PDFs")
         st.caption("Tap/click a PDF to open it in a new tab. Links are temporary.")
 
+        pdf_paths = tuple(row.get("dropbox_path") for row in pdf_rows if row.get("dropbox_path"))
+        try:
+            pdf_links, pdf_errors = _get_temp_links(app_key, app_secret, refresh_token, pdf_paths)
+        except Exception as e:
+            pdf_links, pdf_errors = {}, {p: str(e) for p in pdf_paths}
+
         for i, row in enumerate(pdf_rows):
             fname = (row.get("file_name") or f"scorecard_{i+1}.pdf").strip()
             dbx_path = row.get("dropbox_path")
             if not dbx_path:
                 continue
 
-            try:
-                url = _get_temp_link(app_key, app_secret, refresh_token, dbx_path)
-                # (1) Explicit key to prevent duplicate widget ID issues
+            url = pdf_links.get(dbx_path)
+            if url:
                 st.link_button(
                     f"{fname}",
                     url,
                     width="stretch",
                 )
-            except Exception as e:
-                st.warning(f"Could not create link for '{fname}': {e}")
+            else:
+                st.warning(f"Could not create link for '{fname}': {pdf_errors.get(dbx_path, 'unknown error')}")
@@ -2,9 +2,16 @@
 
 import streamlit as st
 import pandas as pd
+import hashlib
 import json
+import logging
+import os
+from collections import Counter
+import pickle
 import posixpath
 from datetime import datetime, date, time, timedelta
+from pathlib import Path
+from typing import Callable
 from zoneinfo import ZoneInfo
 
 from src.guard import (
@@ -15,7 +22,8 @@ from src.guard import (
     render_sidebar_header,
     render_logout_button,
 )
-from src.dropbox_api import get_access_token, download_file, upload_file, ensure_folder
+from src.dropbox_api import get_access_token, get_file_rev, download_file, upload_file, ensure_folder
+from src import excel_io
 from src.excel_io import load_league_workbook_from_bytes
 from src.db import (
     rebuild_blocks_from_fixtures_if_missing,
@@ -30,13 +38,12 @@ from src.db import (
     ensure_block_prices_from_history_or_default,
     save_fantasy_entry,
     get_fantasy_entry,
+    get_block_results_bundle,
     get_latest_scored_block_number,
-    get_user_block_points,
     get_block_player_points,
     list_block_user_points,
     get_season_user_totals,
     get_user_block_points_history,
-    list_scored_blocks,
     list_scored_fantasy_blocks,
     get_player_block_fantasy_points,
     get_player_season_totals_and_avg,
@@ -58,6 +65,54 @@ render_logout_button()
 st.title("QM Fantasy Social League")
 FANTASY_SQUAD_SIZE = 8
 FANTASY_BUDGET = 60.0
+# Built once; every kickoff, lock and "now" timestamp on this page is London time.
+LONDON_TZ = ZoneInfo("Europe/London")
+
+# Budget card styling; a static string so it is not rebuilt on every rerun.
+_BUDGET_CSS = """
+    <style>
+    .budget-metrics {
+      display: flex;
+      flex-wrap: nowrap;          /* FORCE single line */
+      gap: 12px;
+      margin-bottom: 10px;
+    }
+
+    .budget-metric {
+      flex: 1 1 0;
+      padding: 12px 14px;
+      border-radius: 12px;
+      border: 1px solid rgba(49,51,63,0.2);
+      background: rgba(255,255,255,0.02);
+      min-width: 0;               /* allow shrinking on mobile */
+    }
+
+    .budget-label {
+      font-size: 13px;
+      color: rgba(49,51,63,0.7);
+      margin-bottom: 4px;
+    }
+
+    .budget-value {
+      font-size: 26px;
+      font-weight: 700;
+      line-height: 1.1;
+      white-space: nowrap;
+    }
+
+    /* Emphasise remaining */
+    .budget-remaining {
+      border: 2px solid rgba(0,123,255,0.6);
+    }
+
+    /* Mobile tweaks */
+    @media (max-width: 640px) {
+      .budget-value {
+        font-size: 22px;          /* slightly smaller but still prominent */
+      }
+    }
+    </style>
+    """
 
 
 def _get_secret(name: str) -> str:
@@ -67,11 +122,62 @@ def _get_secret(name: str) -> str:
     return str(val)
 
 
+@st.cache_resource(ttl=3000, show_spinner=False)
+def _cached_access_token(app_key: str, app_secret: str, refresh_token: str) -> str:
+    # Dropbox access tokens last ~4h; refreshing every 50 minutes keeps a safe margin.
+    return get_access_token(app_key, app_secret, refresh_token)
+
+
+logger = logging.getLogger(__name__)
+
+# Parsed workbooks are pickled here per Dropbox rev so a fresh worker can skip the download + parse.
+WORKBOOK_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+# Keyed on the loader module's source as well, so a deploy that changes parsing or the
+# ExcelLoadResult shape never reads pickles written by the previous code.
+WORKBOOK_CACHE_VERSION = hashlib.sha256(Path(excel_io.__file__).read_bytes()).hexdigest()[:12]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_workbook_for_rev(dropbox_path: str, rev: str, _access_token: str):
+    """
+    Download and parse the workbook once per Dropbox revision.
+    Checks the on-disk cache first; a miss writes the parsed result there atomically.
+    """
+    cache_file = WORKBOOK_CACHE_DIR / f"workbook_{WORKBOOK_CACHE_VERSION}_{rev}.pkl"
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as fh:
+                return pickle.load(fh)
+        except Exception as exc:
+            logger.warning("Discarding unreadable workbook cache '%s': %s", cache_file.name, exc)
+            cache_file.unlink(missing_ok=True)
+
+    xbytes = download_file(_access_token, dropbox_path)
+    data = load_league_workbook_from_bytes(xbytes)
+
+    tmp_file = cache_file.with_suffix(".tmp")
+    try:
+        WORKBOOK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tmp_file.open("wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        for old_file in WORKBOOK_CACHE_DIR.glob("workbook_*.pkl"):
+            if old_file != cache_file:
+                old_file.unlink(missing_ok=True)
+    except Exception as exc:
+        logger.warning("Failed to write workbook cache '%s': %s", cache_file.name, exc)
+        tmp_file.unlink(missing_ok=True)
+    return data
+
+
 @st.cache_data(ttl=60, show_spinner=False)
 def _load_from_dropbox(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str):
-    access_token = get_access_token(app_key, app_secret, refresh_token)
-    xbytes = download_file(access_token, dropbox_path)
-    return load_league_workbook_from_bytes(xbytes)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
+    rev = get_file_rev(access_token, dropbox_path)
+    if not rev:
+        xbytes = download_file(access_token, dropbox_path)
+        return load_league_workbook_from_bytes(xbytes)
+    return _load_workbook_for_rev(dropbox_path, rev, access_token)
 
 
 def _fantasy_points_breakdown_df() -> pd.DataFrame:
@@ -193,14 +299,36 @@ def _format_dt_dd_mmm_hhmm(dt_val: str | None) -> str | None:
     try:
         dt = datetime.fromisoformat(s)
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=ZoneInfo("Europe/London"))
+            dt = dt.replace(tzinfo=LONDON_TZ)
         else:
-            dt = dt.astimezone(ZoneInfo("Europe/London"))
+            dt = dt.astimezone(LONDON_TZ)
         return dt.strftime("%d-%b %H:%M")
     except Exception:
         return str(dt_val)
 
 
+def _format_dt_dd_mmm_hhmm_many(values: list[str | None]) -> list[str | None]:
+    """
+    Vectorised _format_dt_dd_mmm_hhmm for a list of ISO strings (same results per value).
+    Offset-aware values are converted to London time; naive values are already London
+    wall-clock time, so they are formatted as-is. Unparseable values pass through.
+    """
+    raw = pd.Series(list(values), dtype="object").astype("string")
+    text = raw.str.strip()
+    out = raw.mask((text == "").fillna(False), "")
+    parse_mask = (text != "").fillna(False)
+    has_offset = text.str.contains(r"(?:Z|[+-]\d{2}:?\d{2})$", regex=True).fillna(False)
+    for mask, utc in ((parse_mask & has_offset, True), (parse_mask & ~has_offset, False)):
+        if not mask.any():
+            continue
+        parsed = pd.to_datetime(text[mask], format="ISO8601", utc=utc, errors="coerce")
+        if utc:
+            parsed = parsed.dt.tz_convert(LONDON_TZ)
+        parsed = parsed.dropna()
+        out[parsed.index] = parsed.dt.strftime("%d-%b %H:%M")
+    return [None if pd.isna(v) else v for v in out.tolist()]
+
+
 def _parse_iso_datetime(dt_val: str | None) -> datetime | None:
     if dt_val is None:
         return None
@@ -214,9 +342,9 @@ def _parse_iso_datetime(dt_val: str | None) -> datetime | None:
     except Exception:
         return None
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=ZoneInfo("Europe/London"))
+        dt = dt.replace(tzinfo=LONDON_TZ)
     else:
-        dt = dt.astimezone(ZoneInfo("Europe/London"))
+        dt = dt.astimezone(LONDON_TZ)
     return dt
 
 
@@ -275,17 +403,105 @@ def _fixture_results_kickoff_iso(date_val, time_val) -> str | None:
     fixture_time = _parse_fixture_results_time(time_val)
     if fixture_time is None:
         fixture_time = time.min
-    kickoff = datetime.combine(fixture_date, fixture_time).replace(tzinfo=ZoneInfo("Europe/London"))
+    kickoff = datetime.combine(fixture_date, fixture_time).replace(tzinfo=LONDON_TZ)
     return kickoff.isoformat()
 
 
-def _is_active_value(v) -> bool:
-    if v is None or (isinstance(v, float) and pd.isna(v)):
-        return False
-    s = str(v).strip().lower()
-    if s in ("0", "false", "no", "n", "inactive", ""):
-        return False
-    return True
+def _is_active_mask(values: pd.Series) -> pd.Series:
+    """Vectorised Active flag: blanks and 0/false/no/n/inactive (any case) are inactive."""
+    text = values.astype(str).str.strip().str.lower()
+    return values.notna() & ~text.isin(["0", "false", "no", "n", "inactive", ""])
+
+
+def _leaderboard_frame(rows: list[dict], points_key: str, points_label: str) -> pd.DataFrame:
+    """
+    Rank/Name/points table for user leaderboard rows (already ordered by the query).
+    Name is "first last", falling back to the username when both are blank.
+    """
+    df = pd.DataFrame(rows)
+
+    def _text(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series("", index=df.index, dtype="object")
+        return df[col].fillna("").astype(str).str.strip()
+
+    first_name = _text("first_name")
+    last_name = _text("last_name")
+    full_name = (first_name + " " + last_name).str.strip()
+    points = df[points_key] if points_key in df.columns else pd.Series(0.0, index=df.index)
+    return pd.DataFrame(
+        {
+            "Rank": range(1, len(df) + 1),
+            "Name": full_name.where((first_name != "") | (last_name != ""), _text("username")),
+            points_label: pd.to_numeric(points, errors="coerce").fillna(0.0).astype(float),
+        }
+    )
+
+
+def _entry_team_table(
+    entry: dict,
+    label_for: Callable[[str], str],
+    multiplier_names: tuple[str, str],
+    points_by_player: dict[str, float] | None = None,
+) -> pd.DataFrame:
+    """
+    One row per starter, then Bench 1 / Bench 2 when set, for a saved fantasy entry.
+    Columns: PlayerID, Role ("Starting"/"Bench 1"/"Bench 2"), Player, Multiplier and,
+    when points_by_player is given, Points. Callers relabel Role for their view.
+    """
+    starting_ids = list(entry.get("starting_player_ids") or [])
+    bench = [(role, entry.get(key)) for role, key in (("Bench 1", "bench1"), ("Bench 2", "bench2")) if entry.get(key)]
+    ids = pd.Series(starting_ids + [pid for _, pid in bench], dtype="object")
+    captain_name, vice_name = multiplier_names
+    multiplier = (
+        pd.Series("", index=ids.index, dtype="object")
+        .mask(ids == entry.get("vice_captain_id"), vice_name)
+        .mask(ids == entry.get("captain_id"), captain_name)
+    )
+    table = pd.DataFrame(
+        {
+            "PlayerID": ids,
+            "Role": ["Starting"] * len(starting_ids) + [role for role, _ in bench],
+            "Player": ids.map(label_for),
+            "Multiplier": multiplier,
+        }
+    )
+    if points_by_player is not None:
+        table["Points"] = ids.map(points_by_player).fillna(0.0).astype(float)
+    return table
+
+
+def _resolve_auto_subs(
+    starting_ids: list[str], bench_ids: list[str | None], played_ids: set[str]
+) -> tuple[list[str | None], set[str], set[str]]:
+    """
+    Apply bench auto-subs in bench order: each starter without points is replaced by the
+    next bench player who has points. Pure function of plain ids so it can be reused for
+    bulk recomputation. Returns (final on-field ids, subbed-in ids, did-not-play starters).
+    """
+    bench_queue = [bid for bid in bench_ids if bid and bid in played_ids]
+    final_on_field: list[str | None] = []
+    subbed_in: set[str] = set()
+    dnp_starters: set[str] = set()
+    for sid in starting_ids:
+        if sid in played_ids:
+            final_on_field.append(sid)
+            continue
+        dnp_starters.add(sid)
+        if bench_queue:
+            sub = bench_queue.pop(0)
+            final_on_field.append(sub)
+            subbed_in.add(sub)
+        else:
+            final_on_field.append(None)
+    return final_on_field, subbed_in, dnp_starters
+
+
+def _squad_budget_used(price_series: pd.Series, squad_ids: list[str], default_price: float) -> float:
+    """Sum squad prices with one reindex; ids without a price count as default_price."""
+    if not squad_ids:
+        return 0.0
+    return float(price_series.reindex(list(squad_ids)).fillna(default_price).sum())
 
 
 def _app_backup_folder(dropbox_file_path: str) -> str:
@@ -300,7 +516,7 @@ def _fantasy_backup_path(dropbox_file_path: str) -> str:
 def _fantasy_backup_to_dropbox(
     app_key: str, app_secret: str, refresh_token: str, backup_path: str
 ) -> None:
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     payload = export_fantasy_backup_payload()
     content = json.dumps(payload, indent=2).encode("utf-8")
     backup_folder = posixpath.dirname(backup_path)
@@ -314,7 +530,7 @@ def _fantasy_restore_from_dropbox_if_needed(
 ) -> bool:
     if fantasy_has_state():
         return False
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     try:
         raw = download_file(access_token, backup_path)
     except Exception:
@@ -327,6 +543,77 @@ def _fantasy_restore_from_dropbox_if_needed(
         return False
 
 
+# ===================================================
+# Cached DB reads: every widget interaction reruns the page, so these short-TTL
+# wrappers keep repeat reruns off the database. Cleared after this page writes.
+# ===================================================
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_effective_block_state(block_number: int, now_minute: datetime) -> str:
+    # Keyed to the minute, so reruns within the same minute reuse the DB answer.
+    return get_effective_block_state(int(block_number), now_minute)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_block_prices(block_number: int) -> dict[str, float]:
+    return get_block_prices(int(block_number))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_block_player_points(block_number: int) -> dict[str, float]:
+    return get_block_player_points(int(block_number))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_fantasy_entry(block_number: int, user_id: int) -> dict | None:
+    return get_fantasy_entry(int(block_number), int(user_id))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_block_results_bundle(block_number: int, user_id: int) -> dict:
+    return get_block_results_bundle(int(block_number), int(user_id))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_list_blocks_with_fixtures() -> list[dict]:
+    return list_blocks_with_fixtures()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_season_user_totals() -> list[dict]:
+    return get_season_user_totals()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_user_block_points_history(user_id: int) -> list[dict]:
+    return get_user_block_points_history(int(user_id))
+
+
+@st.cache_resource(ttl=300, show_spinner=False, max_entries=2)
+def _rebuild_blocks_for_fixtures(fixtures_df: pd.DataFrame) -> int:
+    """
+    Run the block rebuild once per distinct fixtures table (shared across sessions),
+    so warm reruns skip the DB check. The TTL bounds how long a reset DB goes unrebuilt.
+    """
+    created = rebuild_blocks_from_fixtures_if_missing(fixtures_df)
+    # Block rows may have changed, so drop any block lists cached from before.
+    _clear_fantasy_db_caches()
+    return created
+
+
+def _clear_fantasy_db_caches() -> None:
+    for cached_fn in (
+        _cached_effective_block_state,
+        _cached_block_prices,
+        _cached_block_player_points,
+        _cached_fantasy_entry,
+        _cached_block_results_bundle,
+        _cached_list_blocks_with_fixtures,
+        _cached_season_user_totals,
+        _cached_user_block_points_history,
+    ):
+        cached_fn.clear()
+
+
 @st.cache_data(ttl=60, show_spinner=False)
 def _build_player_season_metrics(scored_blocks: tuple[int, ...]) -> pd.DataFrame:
     player_stats: dict[str, dict[str, object]] = {}
@@ -390,6 +677,8 @@ if not st.session_state.get("fantasy_restore_attempted"):
     )
     st.session_state["fantasy_restore_attempted"] = True
     if restored:
+        _clear_fantasy_db_caches()
+        _rebuild_blocks_for_fixtures.clear()
         st.info("Fantasy data restored from backup.")
 
 with st.spinner("Loading latest league workbook from Dropbox..."):
@@ -399,20 +688,24 @@ with st.spinner("Loading latest league workbook from Dropbox..."):
         st.error(f"Failed to load workbook from Dropbox: {e}")
         st.stop()
 
-fixtures_df = data.fixture_results.copy()
-fixtures_df.columns = [str(c).strip() for c in fixtures_df.columns]
+# Headers are stripped when the workbook is parsed, and st.cache_data already hands
+# each run its own copy of `data`, so the frames are used as-is.
+fixtures_df = data.fixture_results
 
-rebuild_blocks_from_fixtures_if_missing(fixtures_df)
+_rebuild_blocks_for_fixtures(fixtures_df)
 
 current_block = get_current_block_number()
 if current_block is None:
     st.info("No active fantasy blocks available yet.")
     st.stop()
 
-now_london = datetime.now(ZoneInfo("Europe/London"))
-state = get_effective_block_state(current_block, now_london)
+now_london = datetime.now(LONDON_TZ)
+state = _cached_effective_block_state(current_block, now_london.replace(second=0, microsecond=0))
 
-blocks = list_blocks_with_fixtures()
+blocks = _cached_list_blocks_with_fixtures()
+scored_block_numbers = sorted(
+    {int(b.get("block_number")) for b in blocks if b.get("scored_at")}
+)
 current_block_row = next(
     (b for b in blocks if int(b.get("block_number") or 0) == int(current_block)),
     None,
@@ -427,20 +720,23 @@ block_fixtures = get_block_fixtures(current_block)
 fixture_name_map = {}
 fixture_start_map = {}
 if "MatchID" in fixtures_df.columns:
-    fx_tmp = fixtures_df.copy()
-    fx_tmp["MatchID"] = fx_tmp["MatchID"].astype(str).str.strip()
-    if "Home Team" in fx_tmp.columns and "Away Team" in fx_tmp.columns:
-        fx_tmp["Home Team"] = fx_tmp["Home Team"].astype(str).str.strip()
-        fx_tmp["Away Team"] = fx_tmp["Away Team"].astype(str).str.strip()
-    for _, r in fx_tmp.iterrows():
-        mid = str(r.get("MatchID") or "").strip()
+    # Each column is cleaned in a single pass; the loop only walks plain values.
+    def _fx_text(col: str) -> pd.Series | list[str]:
+        if col not in fixtures_df.columns:
+            return [""] * len(fixtures_df)
+        return fixtures_df[col].fillna("").astype(str).str.strip()
+
+    def _fx_raw(col: str) -> pd.Series | list[None]:
+        return fixtures_df[col] if col in fixtures_df.columns else [None] * len(fixtures_df)
+
+    for mid, home, away, date_val, time_val in zip(
+        _fx_text("MatchID"), _fx_text("Home Team"), _fx_text("Away Team"), _fx_raw("Date"), _fx_raw("Time")
+    ):
         if not mid:
             continue
-        home = str(r.get("Home Team") or "").strip() if "Home Team" in fx_tmp.columns else ""
-        away = str(r.get("Away Team") or "").strip() if "Away Team" in fx_tmp.columns else ""
         if home and away:
             fixture_name_map[mid] = f"{home} vs {away}"
-        fixture_start_iso = _fixture_results_kickoff_iso(r.get("Date"), r.get("Time"))
+        fixture_start_iso = _fixture_results_kickoff_iso(date_val, time_val)
         if fixture_start_iso:
             fixture_start_map[mid] = fixture_start_iso
 
@@ -459,11 +755,12 @@ if display_lock_at is None:
 
 if block_fixtures:
     st.markdown("**Fixtures in this block:**")
-    for fx in block_fixtures:
-        match_id = fx.get("match_id", "")
-        match_id_str = str(match_id).strip()
+    block_match_ids = [str(fx.get("match_id", "")).strip() for fx in block_fixtures]
+    block_start_fmt = _format_dt_dd_mmm_hhmm_many(
+        [fixture_start_map.get(mid, fx.get("start_at")) for mid, fx in zip(block_match_ids, block_fixtures)]
+    )
+    for match_id_str, start_at in zip(block_match_ids, block_start_fmt):
         fixture_name = fixture_name_map.get(match_id_str, match_id_str)
-        start_at = _format_dt_dd_mmm_hhmm(fixture_start_map.get(match_id_str, fx.get("start_at")))
         st.write(f"- {start_at} — {fixture_name}")
 else:
     st.info("No fixtures found for this block.")
@@ -506,8 +803,7 @@ if league_df is None or league_df.empty:
     st.info("No player data found (League_Data_Stats table not loaded).")
     st.stop()
 
-league = league_df.copy()
-league.columns = [str(c).strip() for c in league.columns]
+league = league_df
 
 player_id_col = _find_col(league, ["PlayerID", "Player Id", "Player ID"])
 name_col = _find_col(league, ["Name"])
@@ -521,21 +817,17 @@ if not player_id_col or not name_col:
 players_df = getattr(data, "players", None)
 eligible_player_ids_from_player_data: set[str] | None = None
 if players_df is not None and not players_df.empty:
-    players_lookup = players_df.copy()
-    players_lookup.columns = [str(c).strip() for c in players_lookup.columns]
-    player_data_id_col = _find_col(players_lookup, ["PlayerID", "Player Id", "Player ID"])
-    player_data_team_col = _find_col(players_lookup, ["TeamID", "Team Id", "Team ID"])
+    player_data_id_col = _find_col(players_df, ["PlayerID", "Player Id", "Player ID"])
+    player_data_team_col = _find_col(players_df, ["TeamID", "Team Id", "Team ID"])
     if player_data_id_col and player_data_team_col:
-        players_lookup[player_data_id_col] = players_lookup[player_data_id_col].astype(str).str.strip()
-        team_id_clean = players_lookup[player_data_team_col].astype(str).str.strip()
+        player_data_ids = players_df[player_data_id_col].astype(str).str.strip()
+        team_id_clean = players_df[player_data_team_col].astype(str).str.strip()
         valid_team_mask = (
-            players_lookup[player_data_team_col].notna()
+            players_df[player_data_team_col].notna()
             & ~team_id_clean.isin(["", "-", "None", "nan", "NaN"])
             & (team_id_clean.str.casefold() != "missing")
         )
-        eligible_player_ids_from_player_data = set(
-            players_lookup.loc[valid_team_mask, player_data_id_col].astype(str).str.strip()
-        )
+        eligible_player_ids_from_player_data = set(player_data_ids[valid_team_mask])
 
 teams_df = getattr(data, "teams_table", None)
 if teams_df is None:
@@ -545,51 +837,55 @@ if teams_df is None:
 
 team_id_to_name: dict[str, str] = {}
 if teams_df is not None and not teams_df.empty:
-    teams = teams_df.copy()
-    teams.columns = [str(c).strip() for c in teams.columns]
-    team_id_col_teams = _find_col(teams, ["TeamID"])
-    team_name_col_teams = _find_col(teams, ["Team Names"])
+    team_id_col_teams = _find_col(teams_df, ["TeamID"])
+    team_name_col_teams = _find_col(teams_df, ["Team Names"])
     if team_id_col_teams and team_name_col_teams:
-        ttmp = teams[[team_id_col_teams, team_name_col_teams]].copy()
-        ttmp[team_id_col_teams] = ttmp[team_id_col_teams].astype(str).str.strip()
-        ttmp[team_name_col_teams] = ttmp[team_name_col_teams].astype(str).str.strip()
-        ttmp = ttmp[(ttmp[team_id_col_teams] != "") & (ttmp[team_name_col_teams] != "")].drop_duplicates()
-        team_id_to_name = dict(zip(ttmp[team_id_col_teams], ttmp[team_name_col_teams]))
-
-# Filter out players with missing names to avoid blank selector entries.
-missing_name_mask = league[name_col].isna() | league[name_col].astype(str).str.strip().isin(["", "-"])
-league = league[~missing_name_mask].copy()
+        ttmp = pd.DataFrame(
+            {
+                "id": teams_df[team_id_col_teams].astype(str).str.strip(),
+                "name": teams_df[team_name_col_teams].astype(str).str.strip(),
+            }
+        )
+        ttmp = ttmp[(ttmp["id"] != "") & (ttmp["name"] != "")].drop_duplicates()
+        team_id_to_name = dict(zip(ttmp["id"], ttmp["name"]))
 
-league[player_id_col] = league[player_id_col].astype(str).str.strip()
-league[name_col] = league[name_col].astype(str).str.strip()
+# Key columns are stripped once; every row filter below is folded into one mask and
+# applied with a single copy.
+player_id_clean = league[player_id_col].astype(str).str.strip()
+name_clean = league[name_col].astype(str).str.strip()
 
-league = league[league[player_id_col] != ""].copy()
+# Filter out players with missing names to avoid blank selector entries.
+keep_mask = league[name_col].notna() & ~name_clean.isin(["", "-"]) & (player_id_clean != "")
 
 if eligible_player_ids_from_player_data is not None:
-    league = league[league[player_id_col].isin(eligible_player_ids_from_player_data)].copy()
+    keep_mask &= player_id_clean.isin(eligible_player_ids_from_player_data)
 
+team_id_clean = None
 if team_id_col_league and team_id_col_league in league.columns:
-    team_id_raw = league[team_id_col_league]
-    team_id_clean = team_id_raw.astype(str).str.strip()
-    missing_team_mask = (
-        team_id_raw.isna()
-        | team_id_clean.isin(["", "-", "None", "nan", "NaN"])
-        | (team_id_clean.str.casefold() == "missing")
+    team_id_clean = league[team_id_col_league].astype(str).str.strip()
+    keep_mask &= (
+        league[team_id_col_league].notna()
+        & ~team_id_clean.isin(["", "-", "None", "nan", "NaN"])
+        & (team_id_clean.str.casefold() != "missing")
     )
-    league = league[~missing_team_mask].copy()
-    league[team_id_col_league] = league[team_id_col_league].astype(str).str.strip()
 
 if active_col and active_col in league.columns:
-    league = league[league[active_col].apply(_is_active_value)].copy()
+    keep_mask &= _is_active_mask(league[active_col])
+
+league = league[keep_mask].copy()
+league[player_id_col] = player_id_clean[keep_mask]
+league[name_col] = name_clean[keep_mask]
+if team_id_clean is not None:
+    league[team_id_col_league] = team_id_clean[keep_mask]
 
 if team_id_col_league and team_id_col_league in league.columns and team_id_to_name:
     league["Team"] = league[team_id_col_league].map(team_id_to_name)
 else:
     league["Team"] = None
 
-player_ids = league[player_id_col].astype(str).str.strip().tolist()
+player_ids = league[player_id_col].tolist()
 
-prices = get_block_prices(current_block)
+prices = _cached_block_prices(current_block)
 if not prices:
     combined_stats_for_prices = _filter_valid_player_rows_for_pricing(getattr(data, "combined_stats", None))
     prices = ensure_block_prices_from_history_or_default(
@@ -603,30 +899,36 @@ if not prices:
         ],
         default_price=7.5,
     )
+    _cached_block_prices.clear()
+
+# Labels and lookups are built column-wise; PlayerID and Name were stripped above
+# (blank ids already dropped) and Team falls back to "Unknown".
+player_team = league["Team"].fillna("").astype(str).str.strip()
+player_frame = pd.DataFrame(
+    {
+        "player_id": league[player_id_col],
+        "name": league[name_col],
+        "team": player_team.mask(player_team == "", "Unknown"),
+    }
+)
+player_frame["price"] = player_frame["player_id"].map(prices).fillna(7.5).astype(float)
+player_frame["label"] = (
+    player_frame["price"].map("{:.1f}".format).astype(str) + " – " + player_frame["name"] + " – " + player_frame["team"]
+)
+
+pid_list = player_frame["player_id"].tolist()
+player_label_by_id: dict[str, str] = dict(zip(pid_list, player_frame["label"].tolist()))
+player_team_by_id: dict[str, str] = dict(zip(pid_list, player_frame["team"].tolist()))
+player_name_by_id: dict[str, str] = dict(zip(pid_list, player_frame["name"].tolist()))
+player_price_by_id: dict[str, float] = dict(zip(pid_list, player_frame["price"].tolist()))
+# Price lookup as a Series (last duplicate id wins, like the dict) for vectorised budget sums.
+player_price_series = pd.Series(player_price_by_id, dtype="float64")
 
-player_rows = []
-player_label_by_id: dict[str, str] = {}
-player_team_by_id: dict[str, str] = {}
-player_name_by_id: dict[str, str] = {}
-player_price_by_id: dict[str, float] = {}
-
-for _, r in league.iterrows():
-    pid = str(r.get(player_id_col, "")).strip()
-    if not pid:
-        continue
-    name = str(r.get(name_col, "")).strip()
-    team = str(r.get("Team", "")).strip() or "Unknown"
-    price = float(prices.get(pid, 7.5))
-    label = f"{price:.1f} – {name} – {team}"
-    player_label_by_id[pid] = label
-    player_team_by_id[pid] = team
-    player_name_by_id[pid] = name
-    player_price_by_id[pid] = price
-    player_rows.append({"player_id": pid, "label": label})
-
-player_rows = sorted(player_rows, key=lambda x: x["label"])
-player_labels = [r["label"] for r in player_rows]
-player_id_by_label = {r["label"]: r["player_id"] for r in player_rows}
+player_frame = player_frame.sort_values("label", kind="stable")
+player_labels = player_frame["label"].tolist()
+# Player ids in label order, used to build the "add player" options.
+player_ids_by_label_order = player_frame["player_id"].tolist()
+player_id_by_label = dict(zip(player_labels, player_ids_by_label_order))
 
 user = st.session_state.get("user") or {}
 user_id = user.get("user_id")
@@ -634,7 +936,7 @@ if not user_id:
     st.error("User ID not found in session.")
     st.stop()
 
-entry = get_fantasy_entry(current_block, int(user_id))
+entry = _cached_fantasy_entry(current_block, int(user_id))
 default_squad_ids = entry.get("squad_player_ids", []) if entry else []
 default_starting_ids = entry.get("starting_player_ids", []) if entry else []
 default_bench1 = entry.get("bench1") if entry else None
@@ -689,6 +991,395 @@ else:
 st.session_state[last_block_key] = int(current_block)
 editing = bool(st.session_state.get(editing_key))
 
+
+@st.fragment
+def _render_team_editor() -> None:
+    """
+    Team editor for the current block. Runs as a fragment, so adding/removing players and
+    picking bench/captain only rerun this section instead of the whole page.
+    """
+    # Lock/edit state comes from the last full run. Redraw the whole page if the team was
+    # submitted on a previous fragment run or the lock time has passed since.
+    lock_passed = (
+        lock_at_dt is not None
+        and not override_open_active
+        and datetime.now(LONDON_TZ) >= lock_at_dt
+    )
+    if not st.session_state.get(editing_key) or lock_passed:
+        st.rerun()
+
+    # Track selection state for the selector; keep it stable so session_state is the source of truth.
+    squad_key = "fantasy_player_select"
+    prev_key = f"fantasy_prev_selected_ids_{current_block}"
+    init_key = f"fantasy_squad_initialized_{current_block}"
+
+    def _as_pid_list(v) -> list[str]:
+        """Normalize session state values to a list[str] of PlayerIDs."""
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [v]
+        try:
+            return list(v)
+        except Exception:
+            return []
+
+    # Re-initialize the squad selection from the saved entry when entering edit mode.
+    # This prevents stale session_state from overwriting the saved team after submission.
+    if not st.session_state.get(init_key):
+        # Seed from saved entry if present; otherwise start empty for a new block.
+        if entry and entry.get("squad_player_ids"):
+            seed_ids = entry.get("squad_player_ids", [])
+        else:
+            seed_ids = []
+        # Normalize and keep only valid PlayerIDs.
+        seed_ids = [str(pid).strip() for pid in seed_ids if pid and str(pid).strip() in player_label_by_id]
+        st.session_state[squad_key] = seed_ids
+        st.session_state[init_key] = True
+        # Ensure the add picker starts blank each edit session.
+        st.session_state[f"fantasy_add_pick_{current_block}"] = None
+
+    # Normalize in-memory squad to avoid string-vs-list bugs and drop invalid IDs.
+    st.session_state[squad_key] = _as_pid_list(
+        st.session_state.get(squad_key, [])
+    )
+    st.session_state[squad_key] = [
+        str(pid).strip()
+        for pid in st.session_state[squad_key]
+        if pid and str(pid).strip() in player_label_by_id
+    ]
+
+    # Session state is the single source of truth for the current selection.
+    selected_for_calc = st.session_state[squad_key]
+    selected_ids = [str(pid) for pid in selected_for_calc if str(pid) in player_label_by_id]
+
+    # Budget/team cap calculations are derived from the current selection state.
+    budget_cap = 60.0
+    selected_for_calc = selected_ids
+    selected_prices = [player_price_by_id.get(pid) for pid in selected_for_calc]
+    spent_budget = sum(
+        p for p in selected_prices if isinstance(p, (int, float)) and not pd.isna(p)
+    )
+    remaining_budget = budget_cap - spent_budget
+
+    selected_teams = [player_team_by_id.get(pid, "Unknown") or "Unknown" for pid in selected_for_calc]
+    team_counts = Counter(selected_teams)
+    capped_teams = {team for team, count in team_counts.items() if count >= 4}
+
+    # Render metric-style budget cards using flex so they stay on one line on mobile without losing emphasis.
+    st.markdown(_BUDGET_CSS, unsafe_allow_html=True)
+    budget_html = f"""
+    <div class="budget-metrics">
+      <div class="budget-metric">
+        <div class="budget-label">Budget Cap</div>
+        <div class="budget-value">{budget_cap:.1f}</div>
+      </div>
+      <div class="budget-metric">
+        <div class="budget-label">Spent</div>
+        <div class="budget-value">{spent_budget:.1f}</div>
+      </div>
+      <div class="budget-metric budget-remaining">
+        <div class="budget-label">Remaining</div>
+        <div class="budget-value">{remaining_budget:.1f}</div>
+      </div>
+    </div>
+    """
+    st.markdown(budget_html, unsafe_allow_html=True)
+    if remaining_budget < 0:
+        st.error("Remaining budget is negative. Please adjust your selections.")
+
+    # Build addable options (single-select): exclude selected, capped teams, unaffordable players.
+    addable_ids = []
+    for pid in player_ids_by_label_order:
+        if pid in selected_for_calc:
+            continue
+        team = player_team_by_id.get(pid, "Unknown") or "Unknown"
+        price = player_price_by_id.get(pid)
+        affordable = isinstance(price, (int, float)) and not pd.isna(price) and price <= remaining_budget
+        if (team not in capped_teams) and affordable:
+            addable_ids.append(pid)
+
+    # Don't render the table when empty to avoid Streamlit's "empty" placeholder.
+    if selected_for_calc:
+        # Use a checkbox-based removal table for stability and mobile consistency.
+        # Editor key is block-specific so schema changes don't reuse stale state.
+        st.markdown("#### Your team")
+        ver_key = f"fantasy_selected_table_ver_{current_block}"
+        if ver_key not in st.session_state:
+            st.session_state[ver_key] = 0
+
+        selected_rows = []
+        for pid in selected_for_calc:
+            selected_rows.append(
+                {
+                    "PlayerID": pid,
+                    "Player": player_name_by_id.get(pid, pid),
+                    "Team": player_team_by_id.get(pid, "Unknown") or "Unknown",
+                    "Cost": float(player_price_by_id.get(pid, 0.0) or 0.0),
+                    "Remove": False,
+                }
+            )
+        selected_df = pd.DataFrame(selected_rows)
+        display_df = selected_df.drop(columns=["PlayerID"])
+        editor_key = f"fantasy_selected_table_block_{current_block}_v{st.session_state[ver_key]}"
+        edited = st.data_editor(
+            display_df,
+            hide_index=True,
+            width="stretch",
+            column_config={
+                "Player": st.column_config.TextColumn(disabled=True),
+                "Team": st.column_config.TextColumn(disabled=True),
+                "Cost": st.column_config.NumberColumn(disabled=True, format="%.1f"),
+                "Remove": st.column_config.CheckboxColumn("Remove", required=False),
+            },
+            key=editor_key,
+        )
+        if "Remove" in edited.columns:
+            remove_mask = edited["Remove"] == True  # noqa: E712
+            to_remove = [
+                selected_for_calc[i]
+                for i, flag in enumerate(remove_mask.tolist())
+                if flag and i < len(selected_for_calc)
+            ]
+            if to_remove:
+                st.session_state[squad_key] = [
+                    pid for pid in selected_for_calc if str(pid) not in set(to_remove)
+                ]
+                st.session_state[ver_key] = int(st.session_state.get(ver_key, 0)) + 1
+                st.rerun()
+
+    # Selector is always shown unless the team is full.
+    team_is_full = len(selected_for_calc) >= 8
+    if team_is_full:
+        # Hide the selector when full to avoid confusing UX and prevent extra picks.
+        st.info("Team Full – To edit your team remove a player first.")
+    else:
+        # Sort by highest cost first; team/name secondary for readable grouping.
+        def _add_sort_key(pid: str) -> tuple:
+            price = player_price_by_id.get(pid, 0.0)
+            team = player_team_by_id.get(pid, "Unknown") or "Unknown"
+            name = player_name_by_id.get(pid, "")
+            return (-price, team.lower(), name.lower())
+
+        addable_ids = sorted(addable_ids, key=_add_sort_key)
+        addable_labels = [player_label_by_id.get(pid, pid) for pid in addable_ids]
+        label_to_pid = {player_label_by_id.get(pid, pid): pid for pid in addable_ids}
+        pick_key = f"fantasy_add_pick_{current_block}"
+
+        def _on_pick_change() -> None:
+            # Auto-add on selection, then reset to blank so the user can pick again quickly.
+            chosen_label = st.session_state.get(pick_key)
+            if not chosen_label:
+                return
+            pid = label_to_pid.get(chosen_label)
+            if not pid:
+                st.session_state[pick_key] = None
+                return
+            current = [str(x) for x in st.session_state.get(squad_key, []) if str(x)]
+            if pid not in current:
+                st.session_state[squad_key] = current + [pid]
+            # Reset picker to blank and rerun to refresh cap/budget filters immediately.
+            st.session_state[pick_key] = None
+
+        if not addable_labels:
+            if remaining_budget > 0:
+                st.warning(
+                    "No affordable players available. Remove a higher-cost player to free up budget."
+                )
+            else:
+                st.warning("No budget remaining. Remove a player to continue.")
+        else:
+            st.selectbox(
+                "Add a player",
+                options=addable_labels,
+                index=None,
+                placeholder="Type to search players...",
+                key=pick_key,
+                on_change=_on_pick_change,
+                disabled=controls_disabled,
+            )
+
+    squad_ids = [str(pid) for pid in st.session_state.get(squad_key, []) if str(pid)]
+    prev_ids = st.session_state.get(prev_key, [])
+    added_ids = [pid for pid in squad_ids if pid not in prev_ids]
+
+    def _remove_last_added(ids: list[str], candidates: set[str]) -> str | None:
+        for pid in reversed(added_ids):
+            if pid in candidates:
+                ids.remove(pid)
+                return pid
+        for pid in reversed(ids):
+            if pid in candidates:
+                ids.remove(pid)
+                return pid
+        return None
+
+    # Belt-and-braces: sanitize selection if team cap or budget is exceeded (e.g., restored state).
+
+    removed_ids: list[str] = []
+
+    # Enforce team cap by removing the most recently added players from capped teams.
+    while True:
+        teams_now = [player_team_by_id.get(pid, "Unknown") or "Unknown" for pid in squad_ids]
+        counts_now = Counter(teams_now)
+        over_cap = {team for team, count in counts_now.items() if count > 4}
+        if not over_cap:
+            break
+        over_cap_ids = {pid for pid in squad_ids if (player_team_by_id.get(pid, "Unknown") or "Unknown") in over_cap}
+        removed = _remove_last_added(squad_ids, over_cap_ids)
+        if removed:
+            removed_ids.append(removed)
+        else:
+            break
+
+    # Enforce budget by removing the most recently added players until within cap.
+    def _spent(ids: list[str]) -> float:
+        return sum(
+            player_price_by_id.get(pid, 0.0)
+            for pid in ids
+            if isinstance(player_price_by_id.get(pid), (int, float))
+            and not pd.isna(player_price_by_id.get(pid))
+        )
+
+    while _spent(squad_ids) > budget_cap:
+        removed = _remove_last_added(squad_ids, set(squad_ids))
+        if removed:
+            removed_ids.append(removed)
+        else:
+            break
+
+    if removed_ids:
+        st.warning("Some selections were removed to enforce the team cap or budget limit.")
+        # Keep PlayerIDs in session state (never labels).
+        st.session_state[squad_key] = [str(pid) for pid in squad_ids if str(pid) in player_label_by_id]
+        st.session_state[prev_key] = squad_ids
+
+    st.session_state[prev_key] = squad_ids
+
+    squad_labels = [player_label_by_id.get(pid, pid) for pid in squad_ids]
+    bench_options = squad_labels if squad_labels else ["(select)"]
+
+    default_bench1_label = player_label_by_id.get(default_bench1)
+    bench1_label = st.selectbox(
+        "Bench 1",
+        options=bench_options,
+        index=bench_options.index(default_bench1_label) if default_bench1_label in bench_options else 0,
+        key=f"fantasy_bench1_{current_block}",
+        disabled=controls_disabled,
+    )
+
+    bench2_options = [lbl for lbl in bench_options if lbl != bench1_label] or ["(select)"]
+    default_bench2_label = player_label_by_id.get(default_bench2)
+    bench2_label = st.selectbox(
+        "Bench 2",
+        options=bench2_options,
+        index=bench2_options.index(default_bench2_label) if default_bench2_label in bench2_options else 0,
+        key=f"fantasy_bench2_{current_block}",
+        disabled=controls_disabled,
+    )
+
+    bench1_id = player_id_by_label.get(bench1_label) if bench1_label in player_id_by_label else ""
+    bench2_id = player_id_by_label.get(bench2_label) if bench2_label in player_id_by_label else ""
+
+    starting_labels = [lbl for lbl in squad_labels if lbl not in [bench1_label, bench2_label]]
+    starting_ids = [player_id_by_label.get(lbl) for lbl in starting_labels if lbl in player_id_by_label]
+    starting_ids = [pid for pid in starting_ids if pid]
+
+    captain_options = starting_labels if starting_labels else ["(select)"]
+    default_captain_label = player_label_by_id.get(default_captain)
+    captain_label = st.selectbox(
+        "Captain (x2)",
+        options=captain_options,
+        index=captain_options.index(default_captain_label) if default_captain_label in captain_options else 0,
+        key=f"fantasy_captain_{current_block}",
+        disabled=controls_disabled,
+    )
+
+    vice_options = [lbl for lbl in captain_options if lbl != captain_label] or ["(select)"]
+    default_vice_label = player_label_by_id.get(default_vice)
+    vice_label = st.selectbox(
+        "Vice-captain (x1.5)",
+        options=vice_options,
+        index=vice_options.index(default_vice_label) if default_vice_label in vice_options else 0,
+        key=f"fantasy_vice_{current_block}",
+        disabled=controls_disabled,
+    )
+
+    captain_id = player_id_by_label.get(captain_label) if captain_label in player_id_by_label else ""
+    vice_id = player_id_by_label.get(vice_label) if vice_label in player_id_by_label else ""
+
+    budget_used = _squad_budget_used(player_price_series, squad_ids, 0.0)
+
+    # Budget metrics are displayed above; avoid duplicating them here.
+
+    errors = []
+    if len(squad_ids) != 8:
+        errors.append("Squad must include exactly 8 players.")
+
+    # One set of each, reused by the membership checks below.
+    squad_set = set(squad_ids)
+    starting_set = set(starting_ids)
+    if len(starting_ids) != 6 or not starting_set <= squad_set:
+        errors.append("Starting lineup must include exactly 6 players from the squad.")
+
+    remaining_ids = [pid for pid in squad_ids if pid not in starting_set]
+    if len(remaining_ids) == 2:
+        if {bench1_id, bench2_id} != set(remaining_ids) or bench1_id == bench2_id:
+            errors.append("Bench 1 and Bench 2 must be the two remaining squad players.")
+    else:
+        errors.append("Bench selections require exactly 2 remaining squad players.")
+
+    if not captain_id or captain_id not in starting_set:
+        errors.append("Captain must be selected from the starting lineup.")
+    if not vice_id or vice_id not in starting_set:
+        errors.append("Vice-captain must be selected from the starting lineup.")
+    if captain_id and vice_id and captain_id == vice_id:
+        errors.append("Captain and Vice-captain must be different players.")
+
+    if budget_used > 60.0:
+        errors.append("Total budget exceeds 60.0.")
+
+    team_counts = Counter(player_team_by_id.get(pid, "Unknown") or "Unknown" for pid in squad_ids)
+    if team_counts and max(team_counts.values()) > 4:
+        errors.append("No more than 4 players can be selected from the same team.")
+
+    if errors:
+        for msg in errors:
+            st.warning(msg)
+
+    if not controls_disabled:
+        if st.button("Submit Team", width="stretch"):
+            if errors:
+                st.error("Please fix the issues above before submitting.")
+            else:
+                submitted_at_iso = datetime.now(LONDON_TZ).isoformat()
+                try:
+                    save_fantasy_entry(
+                        block_number=current_block,
+                        user_id=int(user_id),
+                        squad_player_ids=squad_ids,
+                        starting_player_ids=starting_ids,
+                        bench1=bench1_id,
+                        bench2=bench2_id,
+                        captain_id=captain_id,
+                        vice_captain_id=vice_id,
+                        budget_used=budget_used,
+                        submitted_at_iso=submitted_at_iso,
+                    )
+                    _clear_fantasy_db_caches()
+                    try:
+                        _fantasy_backup_to_dropbox(
+                            app_key, app_secret, refresh_token, backup_path
+                        )
+                    except Exception as e:
+                        st.error(f"Fantasy backup failed: {e}")
+                    st.session_state[editing_key] = False
+                    st.session_state.pop(f"fantasy_squad_initialized_{current_block}", None)
+                    st.success("Fantasy team submitted.")
+                except ValueError as e:
+                    st.error(str(e))
+
+
 st.markdown("---")
 tab_rules, tab_team, tab_results, tab_leaderboard, tab_top = st.tabs(
     ["Fantasy Rules", "Team selector", "Results", "Leaderboard", "Top performers"]
@@ -703,42 +1394,12 @@ with tab_team:
         if entry:
             st.markdown(f"### Selected Team (Block: {state})")
             squad_ids = entry.get("squad_player_ids", [])
-            starting_ids = entry.get("starting_player_ids", [])
-            bench1_id = entry.get("bench1")
-            bench2_id = entry.get("bench2")
-            captain_id = entry.get("captain_id")
-            vice_id = entry.get("vice_captain_id")
-
-            rows = []
-            for pid in starting_ids:
-                rows.append(
-                    {
-                        "Role": "Starting",
-                        "Multiplier": "Captain (x2)" if pid == captain_id else "Vice (x1.5)" if pid == vice_id else "",
-                        "Player": _player_label(pid),
-                    }
-                )
-            if bench1_id:
-                rows.append(
-                    {
-                        "Role": "Bench 1",
-                        "Multiplier": "Captain (x2)" if bench1_id == captain_id else "Vice (x1.5)" if bench1_id == vice_id else "",
-                        "Player": _player_label(bench1_id),
-                    }
-                )
-            if bench2_id:
-                rows.append(
-                    {
-                        "Role": "Bench 2",
-                        "Multiplier": "Captain (x2)" if bench2_id == captain_id else "Vice (x1.5)" if bench2_id == vice_id else "",
-                        "Player": _player_label(bench2_id),
-                    }
-                )
 
-            df_selected = pd.DataFrame(rows, columns=["Role", "Player", "Multiplier"])
+            df_selected = _entry_team_table(entry, _player_label, ("Captain (x2)", "Vice (x1.5)"))
+            df_selected = df_selected[["Role", "Player", "Multiplier"]]
             st.dataframe(df_selected, width="stretch", hide_index=True)
 
-            budget_used = sum(player_price_by_id.get(pid, 0.0) for pid in squad_ids)
+            budget_used = _squad_budget_used(player_price_series, squad_ids, 0.0)
             budget_remaining = 60.0 - budget_used
             st.markdown(f"**Budget used:** {budget_used:.1f} / 60.0")
             st.markdown(f"**Budget remaining:** {budget_remaining:.1f}")
@@ -757,425 +1418,14 @@ with tab_team:
                 else "No team submitted yet."
             )
     else:
-        # Track selection state for the selector; keep it stable so session_state is the source of truth.
-        squad_key = "fantasy_player_select"
-        prev_key = f"fantasy_prev_selected_ids_{current_block}"
-        init_key = f"fantasy_squad_initialized_{current_block}"
-
-        def _as_pid_list(v) -> list[str]:
-            """Normalize session state values to a list[str] of PlayerIDs."""
-            if v is None:
-                return []
-            if isinstance(v, str):
-                return [v]
-            try:
-                return list(v)
-            except Exception:
-                return []
-
-        # Re-initialize the squad selection from the saved entry when entering edit mode.
-        # This prevents stale session_state from overwriting the saved team after submission.
-        if not st.session_state.get(init_key):
-            # Seed from saved entry if present; otherwise start empty for a new block.
-            if entry and entry.get("squad_player_ids"):
-                seed_ids = entry.get("squad_player_ids", [])
-            else:
-                seed_ids = []
-            # Normalize and keep only valid PlayerIDs.
-            seed_ids = [str(pid).strip() for pid in seed_ids if pid and str(pid).strip() in player_label_by_id]
-            st.session_state[squad_key] = seed_ids
-            st.session_state[init_key] = True
-            # Ensure the add picker starts blank each edit session.
-            st.session_state[f"fantasy_add_pick_{current_block}"] = None
-
-        # Normalize in-memory squad to avoid string-vs-list bugs and drop invalid IDs.
-        st.session_state[squad_key] = _as_pid_list(
-            st.session_state.get(squad_key, [])
-        )
-        st.session_state[squad_key] = [
-            str(pid).strip()
-            for pid in st.session_state[squad_key]
-            if pid and str(pid).strip() in player_label_by_id
-        ]
-
-        # Session state is the single source of truth for the current selection.
-        selected_for_calc = st.session_state[squad_key]
-        selected_ids = [str(pid) for pid in selected_for_calc if str(pid) in player_label_by_id]
-
-        # Budget/team cap calculations are derived from the current selection state.
-        budget_cap = 60.0
-        selected_for_calc = selected_ids
-        selected_prices = [player_price_by_id.get(pid) for pid in selected_for_calc]
-        spent_budget = sum(
-            p for p in selected_prices if isinstance(p, (int, float)) and not pd.isna(p)
-        )
-        remaining_budget = budget_cap - spent_budget
-
-        selected_teams = [player_team_by_id.get(pid, "Unknown") or "Unknown" for pid in selected_for_calc]
-        team_counts = pd.Series(selected_teams).value_counts().to_dict()
-        capped_teams = {team for team, count in team_counts.items() if count >= 4}
-
-        # Render metric-style budget cards using flex so they stay on one line on mobile without losing emphasis.
-        st.markdown(
-            """
-            <style>
-            .budget-metrics {
-              display: flex;
-              flex-wrap: nowrap;          /* FORCE single line */
-              gap: 12px;
-              margin-bottom: 10px;
-            }
-
-            .budget-metric {
-              flex: 1 1 0;
-              padding: 12px 14px;
-              border-radius: 12px;
-              border: 1px solid rgba(49,51,63,0.2);
-              background: rgba(255,255,255,0.02);
-              min-width: 0;               /* allow shrinking on mobile */
-            }
-
-            .budget-label {
-              font-size: 13px;
-              color: rgba(49,51,63,0.7);
-              margin-bottom: 4px;
-            }
+        _render_team_editor()
 
-            .budget-value {
-              font-size: 26px;
-              font-weight: 700;
-              line-height: 1.1;
-              white-space: nowrap;
-            }
-
-            /* Emphasise remaining */
-            .budget-remaining {
-              border: 2px solid rgba(0,123,255,0.6);
-            }
-
-            /* Mobile tweaks */
-            @media (max-width: 640px) {
-              .budget-value {
-                font-size: 22px;          /* slightly smaller but still prominent */
-              }
-            }
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
-        budget_html = f"""
-        <div class="budget-metrics">
-          <div class="budget-metric">
-            <div class="budget-label">Budget Cap</div>
-            <div class="budget-value">{budget_cap:.1f}</div>
-          </div>
-          <div class="budget-metric">
-            <div class="budget-label">Spent</div>
-            <div class="budget-value">{spent_budget:.1f}</div>
-          </div>
-          <div class="budget-metric budget-remaining">
-            <div class="budget-label">Remaining</div>
-            <div class="budget-value">{remaining_budget:.1f}</div>
-          </div>
-        </div>
-        """
-        st.markdown(budget_html, unsafe_allow_html=True)
-        if remaining_budget < 0:
-            st.error("Remaining budget is negative. Please adjust your selections.")
-
-        # Build addable options (single-select): exclude selected, capped teams, unaffordable players.
-        addable_ids = []
-        for row in player_rows:
-            pid = row["player_id"]
-            if pid in selected_for_calc:
-                continue
-            team = player_team_by_id.get(pid, "Unknown") or "Unknown"
-            price = player_price_by_id.get(pid)
-            affordable = isinstance(price, (int, float)) and not pd.isna(price) and price <= remaining_budget
-            if (team not in capped_teams) and affordable:
-                addable_ids.append(pid)
-
-        # Don't render the table when empty to avoid Streamlit's "empty" placeholder.
-        if selected_for_calc:
-            # Use a checkbox-based removal table for stability and mobile consistency.
-            # Editor key is block-specific so schema changes don't reuse stale state.
-            st.markdown("#### Your team")
-            ver_key = f"fantasy_selected_table_ver_{current_block}"
-            if ver_key not in st.session_state:
-                st.session_state[ver_key] = 0
-
-            selected_rows = []
-            for pid in selected_for_calc:
-                selected_rows.append(
-                    {
-                        "PlayerID": pid,
-                        "Player": player_name_by_id.get(pid, pid),
-                        "Team": player_team_by_id.get(pid, "Unknown") or "Unknown",
-                        "Cost": float(player_price_by_id.get(pid, 0.0) or 0.0),
-                        "Remove": False,
-                    }
-                )
-            selected_df = pd.DataFrame(selected_rows)
-            display_df = selected_df.drop(columns=["PlayerID"])
-            editor_key = f"fantasy_selected_table_block_{current_block}_v{st.session_state[ver_key]}"
-            edited = st.data_editor(
-                display_df,
-                hide_index=True,
-                width="stretch",
-                column_config={
-                    "Player": st.column_config.TextColumn(disabled=True),
-                    "Team": st.column_config.TextColumn(disabled=True),
-                    "Cost": st.column_config.NumberColumn(disabled=True, format="%.1f"),
-                    "Remove": st.column_config.CheckboxColumn("Remove", required=False),
-                },
-                key=editor_key,
-            )
-            if "Remove" in edited.columns:
-                remove_mask = edited["Remove"] == True  # noqa: E712
-                to_remove = [
-                    selected_for_calc[i]
-                    for i, flag in enumerate(remove_mask.tolist())
-                    if flag and i < len(selected_for_calc)
-                ]
-                if to_remove:
-                    st.session_state[squad_key] = [
-                        pid for pid in selected_for_calc if str(pid) not in set(to_remove)
-                    ]
-                    st.session_state[ver_key] = int(st.session_state.get(ver_key, 0)) + 1
-                    st.rerun()
-
-        # Selector is always shown unless the team is full.
-        team_is_full = len(selected_for_calc) >= 8
-        if team_is_full:
-            # Hide the selector when full to avoid confusing UX and prevent extra picks.
-            st.info("Team Full – To edit your team remove a player first.")
-        else:
-            # Sort by highest cost first; team/name secondary for readable grouping.
-            def _add_sort_key(pid: str) -> tuple:
-                price = player_price_by_id.get(pid, 0.0)
-                team = player_team_by_id.get(pid, "Unknown") or "Unknown"
-                name = player_name_by_id.get(pid, "")
-                return (-price, team.lower(), name.lower())
-
-            addable_ids = sorted(addable_ids, key=_add_sort_key)
-            addable_labels = [player_label_by_id.get(pid, pid) for pid in addable_ids]
-            label_to_pid = {player_label_by_id.get(pid, pid): pid for pid in addable_ids}
-            pick_key = f"fantasy_add_pick_{current_block}"
-
-            def _on_pick_change() -> None:
-                # Auto-add on selection, then reset to blank so the user can pick again quickly.
-                chosen_label = st.session_state.get(pick_key)
-                if not chosen_label:
-                    return
-                pid = label_to_pid.get(chosen_label)
-                if not pid:
-                    st.session_state[pick_key] = None
-                    return
-                current = [str(x) for x in st.session_state.get(squad_key, []) if str(x)]
-                if pid not in current:
-                    st.session_state[squad_key] = current + [pid]
-                # Reset picker to blank and rerun to refresh cap/budget filters immediately.
-                st.session_state[pick_key] = None
-
-            if not addable_labels:
-                if remaining_budget > 0:
-                    st.warning(
-                        "No affordable players available. Remove a higher-cost player to free up budget."
-                    )
-                else:
-                    st.warning("No budget remaining. Remove a player to continue.")
-            else:
-                st.selectbox(
-                    "Add a player",
-                    options=addable_labels,
-                    index=None,
-                    placeholder="Type to search players...",
-                    key=pick_key,
-                    on_change=_on_pick_change,
-                    disabled=controls_disabled,
-                )
-
-        squad_ids = [str(pid) for pid in st.session_state.get(squad_key, []) if str(pid)]
-        prev_ids = st.session_state.get(prev_key, [])
-        added_ids = [pid for pid in squad_ids if pid not in prev_ids]
-
-        def _remove_last_added(ids: list[str], candidates: set[str]) -> str | None:
-            for pid in reversed(added_ids):
-                if pid in candidates:
-                    ids.remove(pid)
-                    return pid
-            for pid in reversed(ids):
-                if pid in candidates:
-                    ids.remove(pid)
-                    return pid
-            return None
-
-        # Belt-and-braces: sanitize selection if team cap or budget is exceeded (e.g., restored state).
-
-        removed_ids: list[str] = []
-
-        # Enforce team cap by removing the most recently added players from capped teams.
-        while True:
-            teams_now = [player_team_by_id.get(pid, "Unknown") or "Unknown" for pid in squad_ids]
-            counts_now = pd.Series(teams_now).value_counts().to_dict()
-            over_cap = {team for team, count in counts_now.items() if count > 4}
-            if not over_cap:
-                break
-            over_cap_ids = {pid for pid in squad_ids if (player_team_by_id.get(pid, "Unknown") or "Unknown") in over_cap}
-            removed = _remove_last_added(squad_ids, over_cap_ids)
-            if removed:
-                removed_ids.append(removed)
-            else:
-                break
-
-        # Enforce budget by removing the most recently added players until within cap.
-        def _spent(ids: list[str]) -> float:
-            return sum(
-                player_price_by_id.get(pid, 0.0)
-                for pid in ids
-                if isinstance(player_price_by_id.get(pid), (int, float))
-                and not pd.isna(player_price_by_id.get(pid))
-            )
-
-        while _spent(squad_ids) > budget_cap:
-            removed = _remove_last_added(squad_ids, set(squad_ids))
-            if removed:
-                removed_ids.append(removed)
-            else:
-                break
-
-        if removed_ids:
-            st.warning("Some selections were removed to enforce the team cap or budget limit.")
-            # Keep PlayerIDs in session state (never labels).
-            st.session_state[squad_key] = [str(pid) for pid in squad_ids if str(pid) in player_label_by_id]
-            st.session_state[prev_key] = squad_ids
-
-        st.session_state[prev_key] = squad_ids
-
-        squad_labels = [player_label_by_id.get(pid, pid) for pid in squad_ids]
-        bench_options = squad_labels if squad_labels else ["(select)"]
-
-        bench1_label = st.selectbox(
-            "Bench 1",
-            options=bench_options,
-            index=bench_options.index(player_label_by_id.get(default_bench1)) if default_bench1 in player_label_by_id and player_label_by_id.get(default_bench1) in bench_options else 0,
-            key=f"fantasy_bench1_{current_block}",
-            disabled=controls_disabled,
-        )
-
-        bench2_options = [lbl for lbl in bench_options if lbl != bench1_label] or ["(select)"]
-        bench2_label = st.selectbox(
-            "Bench 2",
-            options=bench2_options,
-            index=bench2_options.index(player_label_by_id.get(default_bench2)) if default_bench2 in player_label_by_id and player_label_by_id.get(default_bench2) in bench2_options else 0,
-            key=f"fantasy_bench2_{current_block}",
-            disabled=controls_disabled,
-        )
-
-        bench1_id = player_id_by_label.get(bench1_label) if bench1_label in player_id_by_label else ""
-        bench2_id = player_id_by_label.get(bench2_label) if bench2_label in player_id_by_label else ""
-
-        starting_labels = [lbl for lbl in squad_labels if lbl not in [bench1_label, bench2_label]]
-        starting_ids = [player_id_by_label.get(lbl) for lbl in starting_labels if lbl in player_id_by_label]
-        starting_ids = [pid for pid in starting_ids if pid]
-
-        captain_options = starting_labels if starting_labels else ["(select)"]
-        captain_label = st.selectbox(
-            "Captain (x2)",
-            options=captain_options,
-            index=captain_options.index(player_label_by_id.get(default_captain)) if default_captain in player_label_by_id and player_label_by_id.get(default_captain) in captain_options else 0,
-            key=f"fantasy_captain_{current_block}",
-            disabled=controls_disabled,
-        )
-
-        vice_options = [lbl for lbl in captain_options if lbl != captain_label] or ["(select)"]
-        vice_label = st.selectbox(
-            "Vice-captain (x1.5)",
-            options=vice_options,
-            index=vice_options.index(player_label_by_id.get(default_vice)) if default_vice in player_label_by_id and player_label_by_id.get(default_vice) in vice_options else 0,
-            key=f"fantasy_vice_{current_block}",
-            disabled=controls_disabled,
-        )
-
-        captain_id = player_id_by_label.get(captain_label) if captain_label in player_id_by_label else ""
-        vice_id = player_id_by_label.get(vice_label) if vice_label in player_id_by_label else ""
-
-        budget_used = sum(player_price_by_id.get(pid, 0.0) for pid in squad_ids)
-        budget_remaining = 60.0 - budget_used
-
-        # Budget metrics are displayed above; avoid duplicating them here.
-
-        errors = []
-        if len(squad_ids) != 8:
-            errors.append("Squad must include exactly 8 players.")
-
-        if len(starting_ids) != 6 or not set(starting_ids).issubset(set(squad_ids)):
-            errors.append("Starting lineup must include exactly 6 players from the squad.")
-
-        remaining_ids = [pid for pid in squad_ids if pid not in starting_ids]
-        if len(remaining_ids) == 2:
-            if set([bench1_id, bench2_id]) != set(remaining_ids) or bench1_id == bench2_id:
-                errors.append("Bench 1 and Bench 2 must be the two remaining squad players.")
-        else:
-            errors.append("Bench selections require exactly 2 remaining squad players.")
-
-        if not captain_id or captain_id not in starting_ids:
-            errors.append("Captain must be selected from the starting lineup.")
-        if not vice_id or vice_id not in starting_ids:
-            errors.append("Vice-captain must be selected from the starting lineup.")
-        if captain_id and vice_id and captain_id == vice_id:
-            errors.append("Captain and Vice-captain must be different players.")
-
-        if budget_used > 60.0:
-            errors.append("Total budget exceeds 60.0.")
-
-        team_counts: dict[str, int] = {}
-        for pid in squad_ids:
-            team = player_team_by_id.get(pid, "Unknown") or "Unknown"
-            team_counts[team] = team_counts.get(team, 0) + 1
-        if any(n > 4 for n in team_counts.values()):
-            errors.append("No more than 4 players can be selected from the same team.")
-
-        if errors:
-            for msg in errors:
-                st.warning(msg)
-
-        if not controls_disabled:
-            if st.button("Submit Team", width="stretch"):
-                if errors:
-                    st.error("Please fix the issues above before submitting.")
-                else:
-                    submitted_at_iso = now_london.isoformat()
-                    try:
-                        save_fantasy_entry(
-                            block_number=current_block,
-                            user_id=int(user_id),
-                            squad_player_ids=squad_ids,
-                            starting_player_ids=starting_ids,
-                            bench1=bench1_id,
-                            bench2=bench2_id,
-                            captain_id=captain_id,
-                            vice_captain_id=vice_id,
-                            budget_used=budget_used,
-                            submitted_at_iso=submitted_at_iso,
-                        )
-                        try:
-                            _fantasy_backup_to_dropbox(
-                                app_key, app_secret, refresh_token, backup_path
-                            )
-                        except Exception as e:
-                            st.error(f"Fantasy backup failed: {e}")
-                        st.session_state[editing_key] = False
-                        st.session_state.pop(f"fantasy_squad_initialized_{current_block}", None)
-                        st.success("Fantasy team submitted.")
-                    except ValueError as e:
-                        st.error(str(e))
 
 with tab_results:
     st.subheader("Results")
 
-    season_rows = get_season_user_totals()
-    history = get_user_block_points_history(int(user_id))
+    season_rows = _cached_season_user_totals()
+    history = _cached_user_block_points_history(int(user_id))
     blocks_played = len(history)
     total_users = len(season_rows)
 
@@ -1212,18 +1462,20 @@ with tab_results:
         st.info("No results yet.")
     else:
         st.markdown(f"### Latest Results (Block {latest_block})")
-        user_points = get_user_block_points(latest_block, int(user_id))
+        latest_bundle = _cached_block_results_bundle(latest_block, int(user_id))
+        user_points = latest_bundle["user_total"]
         if user_points is None:
             st.info("You did not submit a team for this block.")
         else:
             st.markdown(f"**Your total:** {user_points:.1f}")
 
-            entry_latest = get_fantasy_entry(latest_block, int(user_id))
+            entry_latest = latest_bundle["entry"]
             if not entry_latest:
                 st.info("You did not submit a team for this block.")
             else:
-                points_by_player = get_block_player_points(latest_block)
-                prices_latest = get_block_prices(latest_block)
+                points_by_player = latest_bundle["points"]
+                prices_latest = latest_bundle["prices"]
+                prices_latest_series = pd.Series(prices_latest, dtype="float64")
 
                 def _label_for_block(pid: str) -> str:
                     price = float(prices_latest.get(pid, 7.5))
@@ -1234,65 +1486,22 @@ with tab_results:
                 starting_ids = entry_latest.get("starting_player_ids", [])
                 bench1_id = entry_latest.get("bench1")
                 bench2_id = entry_latest.get("bench2")
-                captain_id = entry_latest.get("captain_id")
-                vice_id = entry_latest.get("vice_captain_id")
                 squad_ids_latest = entry_latest.get("squad_player_ids", [])
 
-                bench_queue = []
-                for bid in [bench1_id, bench2_id]:
-                    if bid and bid in points_by_player:
-                        bench_queue.append(bid)
-
-                final_on_field = []
-                subbed_in = set()
-                auto_subs_applied = False
-
-                for sid in starting_ids:
-                    if sid in points_by_player:
-                        final_on_field.append(sid)
-                    else:
-                        if bench_queue:
-                            sub = bench_queue.pop(0)
-                            final_on_field.append(sub)
-                            subbed_in.add(sub)
-                            auto_subs_applied = True
-                        else:
-                            final_on_field.append(None)
-
-                rows = []
-                for sid in starting_ids:
-                    rows.append(
-                        {
-                            "Role": "Starting",
-                            "Multiplier": "C" if sid == captain_id else "VC" if sid == vice_id else "",
-                            "Player": _label_for_block(sid),
-                            "Points": float(points_by_player.get(sid, 0.0)),
-                        }
-                    )
-
-                if bench1_id:
-                    rows.append(
-                        {
-                            "Role": "Subbed In" if bench1_id in subbed_in else "Bench",
-                            "Multiplier": "C" if bench1_id == captain_id else "VC" if bench1_id == vice_id else "",
-                            "Player": _label_for_block(bench1_id),
-                            "Points": float(points_by_player.get(bench1_id, 0.0)),
-                        }
-                    )
-                if bench2_id:
-                    rows.append(
-                        {
-                            "Role": "Subbed In" if bench2_id in subbed_in else "Bench",
-                            "Multiplier": "C" if bench2_id == captain_id else "VC" if bench2_id == vice_id else "",
-                            "Player": _label_for_block(bench2_id),
-                            "Points": float(points_by_player.get(bench2_id, 0.0)),
-                        }
-                    )
+                _, subbed_in, _ = _resolve_auto_subs(
+                    starting_ids, [bench1_id, bench2_id], set(points_by_player)
+                )
+                auto_subs_applied = bool(subbed_in)
 
-                df_results = pd.DataFrame(rows, columns=["Role", "Multiplier", "Player", "Points"])
+                df_results = _entry_team_table(entry_latest, _label_for_block, ("C", "VC"), points_by_player)
+                is_bench = df_results["Role"] != "Starting"
+                df_results.loc[is_bench, "Role"] = (
+                    df_results.loc[is_bench, "PlayerID"].isin(subbed_in).map({True: "Subbed In", False: "Bench"})
+                )
+                df_results = df_results[["Role", "Multiplier", "Player", "Points"]]
                 st.dataframe(df_results, width="stretch", hide_index=True)
 
-                budget_used_latest = sum(float(prices_latest.get(pid, 7.5)) for pid in squad_ids_latest)
+                budget_used_latest = _squad_budget_used(prices_latest_series, squad_ids_latest, 7.5)
                 budget_remaining_latest = 60.0 - budget_used_latest
                 st.markdown(f"**Budget used:** {budget_used_latest:.1f} / 60.0")
                 st.markdown(f"**Budget remaining:** {budget_remaining_latest:.1f}")
@@ -1303,8 +1512,7 @@ with tab_results:
     st.markdown("---")
     st.subheader("My Past Teams")
 
-    scored_blocks = list_scored_blocks()
-    scored_blocks = sorted(scored_blocks, reverse=True)
+    scored_blocks = sorted(scored_block_numbers, reverse=True)
 
     if not scored_blocks:
         st.info("No past teams yet.")
@@ -1316,12 +1524,13 @@ with tab_results:
             key="fantasy_past_team_block_select",
         )
 
-        past_entry = get_fantasy_entry(int(selected_past_block), int(user_id))
+        past_bundle = _cached_block_results_bundle(int(selected_past_block), int(user_id))
+        past_entry = past_bundle["entry"]
         if not past_entry:
             st.info("No team submitted for this block.")
         else:
-            past_prices = get_block_prices(int(selected_past_block))
-            past_points = get_block_player_points(int(selected_past_block))
+            past_prices = past_bundle["prices"]
+            past_points = past_bundle["points"]
 
             def _past_label(pid: str) -> str:
                 price = float(past_prices.get(pid, 7.5))
@@ -1332,63 +1541,27 @@ with tab_results:
             starting_ids = past_entry.get("starting_player_ids", [])
             bench1_id = past_entry.get("bench1")
             bench2_id = past_entry.get("bench2")
-            captain_id = past_entry.get("captain_id")
-            vice_id = past_entry.get("vice_captain_id")
-
-            bench_queue = []
-            for bid in [bench1_id, bench2_id]:
-                if bid and bid in past_points:
-                    bench_queue.append(bid)
-
-            subbed_in = set()
-            dnp_starters = set()
-            for sid in starting_ids:
-                if sid in past_points:
-                    continue
-                if bench_queue:
-                    subbed_in.add(bench_queue.pop(0))
-                    dnp_starters.add(sid)
-                else:
-                    dnp_starters.add(sid)
 
-            rows = []
-            for pid in starting_ids:
-                role = "Started" if pid in past_points and pid not in dnp_starters else "Did Not Play"
-                row = {
-                    "Role": role,
-                    "Player": _past_label(pid),
-                    "Multiplier": "Captain" if pid == captain_id else "Vice" if pid == vice_id else "",
-                }
-                if past_points:
-                    row["Points"] = float(past_points.get(pid, 0.0))
-                rows.append(row)
-
-            if bench1_id:
-                role = "Started" if bench1_id in subbed_in else "Bench"
-                row = {
-                    "Role": role,
-                    "Player": _past_label(bench1_id),
-                    "Multiplier": "Captain" if bench1_id == captain_id else "Vice" if bench1_id == vice_id else "",
-                }
-                if past_points:
-                    row["Points"] = float(past_points.get(bench1_id, 0.0))
-                rows.append(row)
-            if bench2_id:
-                role = "Started" if bench2_id in subbed_in else "Bench"
-                row = {
-                    "Role": role,
-                    "Player": _past_label(bench2_id),
-                    "Multiplier": "Captain" if bench2_id == captain_id else "Vice" if bench2_id == vice_id else "",
-                }
-                if past_points:
-                    row["Points"] = float(past_points.get(bench2_id, 0.0))
-                rows.append(row)
+            _, subbed_in, dnp_starters = _resolve_auto_subs(
+                starting_ids, [bench1_id, bench2_id], set(past_points)
+            )
+
+            df_past = _entry_team_table(
+                past_entry, _past_label, ("Captain", "Vice"), past_points if past_points else None
+            )
+            is_bench = df_past["Role"] != "Starting"
+            past_played = df_past["PlayerID"].isin(list(past_points)) & ~df_past["PlayerID"].isin(dnp_starters)
+            df_past["Role"] = "Did Not Play"
+            df_past.loc[~is_bench & past_played, "Role"] = "Started"
+            df_past.loc[is_bench, "Role"] = (
+                df_past.loc[is_bench, "PlayerID"].isin(subbed_in).map({True: "Started", False: "Bench"})
+            )
 
             cols = ["Role", "Player", "Multiplier"]
             if past_points:
                 cols.append("Points")
             st.dataframe(
-                pd.DataFrame(rows, columns=cols),
+                df_past[cols],
                 width="stretch",
                 hide_index=True,
             )
@@ -1396,32 +1569,13 @@ with tab_results:
 with tab_leaderboard:
     st.subheader("Season")
 
-    season_rows = get_season_user_totals()
+    season_rows = _cached_season_user_totals()
     if not season_rows:
         st.info("No season totals yet.")
     else:
-        season_display = []
-        rank = 1
-        for r in season_rows:
-            first_name = str(r.get("first_name") or "").strip()
-            last_name = str(r.get("last_name") or "").strip()
-            username = str(r.get("username") or "").strip()
-            if first_name or last_name:
-                name = f"{first_name} {last_name}".strip()
-            else:
-                name = username
-            season_display.append(
-                {
-                    "Rank": rank,
-                    "Name": name,
-                    "Total Points": float(r.get("total_points") or 0.0),
-                }
-            )
-            rank += 1
-
         st.markdown("### Season Leaderboard")
         st.dataframe(
-            pd.DataFrame(season_display),
+            _leaderboard_frame(season_rows, "total_points", "Total Points"),
             width="stretch",
             hide_index=True,
         )
@@ -1432,12 +1586,7 @@ with tab_leaderboard:
     if latest_block_for_lb is None:
         st.info("No results yet.")
     else:
-        scored_blocks = []
-        all_blocks = list_blocks_with_fixtures()
-        for b in all_blocks:
-            if b.get("scored_at"):
-                scored_blocks.append(int(b.get("block_number")))
-        scored_blocks = sorted(set(scored_blocks), reverse=True)
+        scored_blocks = sorted(scored_block_numbers, reverse=True)
 
         if not scored_blocks:
             st.info("No results yet.")
@@ -1457,27 +1606,8 @@ with tab_leaderboard:
             if not rows:
                 st.info("No user points recorded for this block yet.")
             else:
-                display_rows = []
-                rank = 1
-                for r in rows:
-                    first_name = str(r.get("first_name") or "").strip()
-                    last_name = str(r.get("last_name") or "").strip()
-                    username = str(r.get("username") or "").strip()
-                    if first_name or last_name:
-                        name = f"{first_name} {last_name}".strip()
-                    else:
-                        name = username
-                    display_rows.append(
-                        {
-                            "Rank": rank,
-                            "Name": name,
-                            "Points": float(r.get("points_total") or 0.0),
-                        }
-                    )
-                    rank += 1
-
                 st.dataframe(
-                    pd.DataFrame(display_rows),
+                    _leaderboard_frame(rows, "points_total", "Points"),
                     width="stretch",
                     hide_index=True,
                 )
@@ -1615,7 +1745,7 @@ with tab_leaderboard:
 
 with tab_top:
     st.subheader("Top performers")
-    scored_blocks = sorted(list_scored_blocks())
+    scored_blocks = list(scored_block_numbers)
     if not scored_blocks:
         st.info("No scored blocks yet.")
     else:
@@ -1678,7 +1808,7 @@ with tab_top:
 
             st.markdown("---")
             st.markdown(f"### Current block fantasy points leaderboard (Block {int(latest_scored)})")
-            current_points = get_block_player_points(int(latest_scored))
+            current_points = _cached_block_player_points(int(latest_scored))
             if not current_points:
                 st.info("No player points found for the latest scored block.")
             else:
@@ -1750,8 +1880,8 @@ with tab_top:
             if latest_scored is None or prev_scored is None:
                 st.info("Most improved is available after at least two scored blocks.")
             else:
-                latest_points = get_block_player_points(int(latest_scored))
-                prev_points = get_block_player_points(int(prev_scored))
+                latest_points = _cached_block_player_points(int(latest_scored))
+                prev_points = _cached_block_player_points(int(prev_scored))
                 player_pool = sorted(set(latest_points.keys()) | set(prev_points.keys()))
                 improved_rows = []
                 for pid in player_pool:
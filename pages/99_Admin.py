@@ -70,6 +70,7 @@ from src.dropbox_api import (
     list_folder,
 )
 from src.excel_io import load_league_workbook_from_bytes
+from src.scorecards import matches_with_scorecards
 
 
 st.set_page_config(page_title=f"{APP_TITLE} - Admin", layout="wide")
@@ -95,13 +96,34 @@ def _get_secret(name: str) -> str:
     return str(val)
 
 
-@st.cache_data(ttl=60, show_spinner=False)
+@st.cache_resource(ttl=3000, show_spinner=False)
+def _cached_access_token(app_key: str, app_secret: str, refresh_token: str) -> str:
+    # Dropbox access tokens last ~4h; refreshing every 50 minutes keeps a safe margin.
+    return get_access_token(app_key, app_secret, refresh_token)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_list_users() -> list[dict]:
+    return list_users()
+
+
+@st.cache_data(ttl=30, max_entries=1, show_spinner=False)
+def _cached_total_admins() -> int:
+    return count_admins(active_only=False)
+
+
+def _clear_user_caches() -> None:
+    _cached_list_users.clear()
+    _cached_total_admins.clear()
+
+
+@st.cache_data(ttl=600, max_entries=4, show_spinner=False)
 def _load_workbook_fixture_results(app_key: str, app_secret: str, refresh_token: str, dropbox_path: str) -> pd.DataFrame:
     """
     Loads the league workbook from Dropbox and returns the fixture_results dataframe.
-    Cached briefly to keep Admin UI responsive.
+    Cached for 10 minutes; the fixture schedule rarely changes mid-session.
     """
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     xbytes = download_file(access_token, dropbox_path)
     data = load_league_workbook_from_bytes(xbytes)
     fixtures = data.fixture_results.copy()
@@ -115,7 +137,7 @@ def _load_workbook_combined_stats(app_key: str, app_secret: str, refresh_token:
     Loads the league workbook from Dropbox and returns the Combined_Stats dataframe.
     Cached briefly to keep Admin UI responsive.
     """
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     xbytes = download_file(access_token, dropbox_path)
     data = load_league_workbook_from_bytes(xbytes)
     if getattr(data, "combined_stats", None) is None:
@@ -155,6 +177,39 @@ def _format_time_ampm(series: pd.Series) -> pd.Series:
 
     return series.apply(_format_one)
 
+
+@st.cache_data(ttl=600, max_entries=4, show_spinner=False)
+def _load_fixture_select_options(
+    app_key: str, app_secret: str, refresh_token: str, dropbox_path: str
+) -> tuple[list[str], list[str]] | None:
+    """
+    Builds the scorecard fixture selector as (labels, match_ids), skipping rows without a MatchID.
+    Returns None when the fixtures have no MatchID column.
+    """
+    fixtures = _load_workbook_fixture_results(app_key, app_secret, refresh_token, dropbox_path)
+    if "MatchID" not in fixtures.columns:
+        return None
+
+    def _clean(series: pd.Series) -> pd.Series:
+        return series.astype("string").str.strip().fillna("")
+
+    # Label format matches the main app: MatchID — Date — Time — Home vs Away
+    match_ids = _clean(fixtures["MatchID"])
+    parts = []
+    if "Date" in fixtures.columns:
+        parts.append(_clean(_format_date_dd_mmm(fixtures["Date"])))
+    if "Time" in fixtures.columns:
+        parts.append(_clean(_format_time_ampm(fixtures["Time"])))
+    if "Home Team" in fixtures.columns and "Away Team" in fixtures.columns:
+        parts.append(_clean(fixtures["Home Team"]) + " vs " + _clean(fixtures["Away Team"]))
+
+    labels = match_ids
+    for part in parts:
+        labels = labels.where(part == "", labels + " — " + part)
+
+    keep = match_ids != ""
+    return labels[keep].tolist(), match_ids[keep].tolist()
+
 def _format_dt_dd_mmm_hhmm(dt_val: str | None) -> str | None:
     if dt_val is None:
         return None
@@ -263,7 +318,7 @@ def _users_backup_path(dropbox_file_path: str) -> str:
 def _fantasy_backup_to_dropbox(
     app_key: str, app_secret: str, refresh_token: str, backup_path: str
 ) -> None:
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     payload = export_fantasy_backup_payload()
     content = json.dumps(payload, indent=2).encode("utf-8")
     backup_folder = posixpath.dirname(backup_path)
@@ -275,7 +330,7 @@ def _fantasy_backup_to_dropbox(
 def _users_backup_to_dropbox(
     app_key: str, app_secret: str, refresh_token: str, dropbox_file_path: str
 ) -> None:
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     backup_path = _users_backup_path(dropbox_file_path)
     payload = export_users_backup_payload()
     content = json.dumps(payload, indent=2).encode("utf-8")
@@ -290,7 +345,7 @@ def _fantasy_restore_from_dropbox_if_needed(
 ) -> tuple[bool, str | None]:
     if fantasy_has_state():
         return False, None
-    access_token = get_access_token(app_key, app_secret, refresh_token)
+    access_token = _cached_access_token(app_key, app_secret, refresh_token)
     try:
         raw = download_file(access_token, backup_path)
     except Exception:
@@ -354,7 +409,7 @@ with tab_users:
         except Exception:
             st.success(msg)
 
-    users = list_users()
+    users = _cached_list_users()
     if not users:
         st.info("No users found.")
         st.stop()
@@ -493,7 +548,7 @@ with tab_users:
             st.write(f"**Role:** {selected_role}")
             st.write(f"**Status:** {'Active' if selected_active else 'Disabled'}")
 
-        admins_total = count_admins(active_only=False)
+        admins_total = _cached_total_admins()
 
         def is_last_admin_target() -> bool:
             return selected_role == "admin" and admins_total == 1
@@ -513,6 +568,7 @@ with tab_users:
             if st.button("Save username", width="stretch", key="admin_save_username_btn"):
                 try:
                     update_username(current_username, new_username)
+                    _clear_user_caches()
 
                     current_session_user = st.session_state.get("user") or {}
                     current_session_username = str(current_session_user.get("username") or "").strip()
@@ -544,6 +600,7 @@ with tab_users:
                     st.error("Blocked: You cannot disable the last remaining admin.")
                 else:
                     set_user_active(selected_username, make_active)
+                    _clear_user_caches()
 
                     status_txt = "Active" if make_active else "Disabled"
                     st.session_state["admin_user_action_msg"] = f"Updated '{selected_username}' status to {status_txt}."
@@ -560,6 +617,7 @@ with tab_users:
             ):
                 try:
                     admin_reset_password(selected_username, default_pw)
+                    _clear_user_caches()
 
                     st.session_state["admin_user_action_msg"] = (
                         f"Password reset for '{selected_username}'. User will be prompted to change it on next login."
@@ -587,6 +645,7 @@ with tab_users:
                         st.error("Blocked: You cannot demote the last remaining admin.")
                     else:
                         set_user_role(selected_username, desired_role)
+                        _clear_user_caches()
 
                         st.session_state["admin_user_action_msg"] = (
                             f"Updated '{selected_username}' role to {desired_role}."
@@ -604,6 +663,7 @@ with tab_users:
                     st.error("Blocked: You cannot delete the last remaining admin.")
                 else:
                     delete_user(selected_username)
+                    _clear_user_caches()
                     try:
                         app_key = _get_secret("DROPBOX_APP_KEY")
                         app_secret = _get_secret("DROPBOX_APP_SECRET")
@@ -648,30 +708,17 @@ with tab_scorecards:
     # Load fixtures so admins can pick a MatchID confidently
     with st.spinner("Loading fixtures from Dropbox..."):
         try:
-            fixtures_df = _load_workbook_fixture_results(app_key, app_secret, refresh_token, dropbox_file_path)
+            fixture_options = _load_fixture_select_options(
+                app_key, app_secret, refresh_token, dropbox_file_path
+            )
         except Exception as e:
             st.error(f"Failed to load fixtures from Dropbox: {e}")
             st.stop()
 
-    if "MatchID" not in fixtures_df.columns:
+    if fixture_options is None:
         st.error("Cannot find required column 'MatchID' in fixtures. Please confirm it exists in the workbook.")
         st.stop()
 
-    # Build a friendly label if columns exist
-    cols = fixtures_df.columns.tolist()
-    has_date = "Date" in cols
-    has_time = "Time" in cols
-    has_home = "Home Team" in cols
-    has_away = "Away Team" in cols
-
-    fixture_rows = fixtures_df.copy()
-
-    # Format Admin fixture selector display to match main app
-    if has_date:
-        fixture_rows["Date"] = _format_date_dd_mmm(fixture_rows["Date"])
-    if has_time:
-        fixture_rows["Time"] = _format_time_ampm(fixture_rows["Time"])
-
     def _safe_str(v) -> str:
         if pd.isna(v):
             return ""
@@ -733,25 +780,8 @@ with tab_scorecards:
 
         return f"{base_prefix} {max_n + 1}{ext}"
     
-    options = []
-    option_to_match_id = {}
-
-    for _, r in fixture_rows.iterrows():
-        mid = _safe_str(r.get("MatchID"))
-        if not mid:
-            continue
-
-        parts = [mid]
-        if has_date:
-            parts.append(_safe_str(r.get("Date")))
-        if has_time:
-            parts.append(_safe_str(r.get("Time")))
-        if has_home and has_away:
-            parts.append(f"{_safe_str(r.get('Home Team'))} vs {_safe_str(r.get('Away Team'))}")
-        label = " — ".join([p for p in parts if p])
-
-        options.append(label)
-        option_to_match_id[label] = mid
+    options, option_match_ids = fixture_options
+    option_to_match_id = dict(zip(options, option_match_ids))
 
     if not options:
         st.info("No fixtures with a valid MatchID were found.")
@@ -784,7 +814,7 @@ with tab_scorecards:
 
     if do_upload:
         try:
-            access_token = get_access_token(app_key, app_secret, refresh_token)
+            access_token = _cached_access_token(app_key, app_secret, refresh_token)
 
             # Ensure /scorecards and /scorecards/<MatchID> exist
             ensure_folder(access_token, scorecards_root)
@@ -794,7 +824,7 @@ with tab_scorecards:
             uploader_username = (st.session_state.get("user") or {}).get("username", "")
 
             # Pull Home/Away names for this MatchID (for renaming)
-            fx = fixtures_df.copy()
+            fx = _load_workbook_fixture_results(app_key, app_secret, refresh_token, dropbox_file_path)
             fx["MatchID"] = fx["MatchID"].astype(str).str.strip()
             fx_row = fx[fx["MatchID"] == str(match_id).strip()]
 
@@ -878,6 +908,7 @@ with tab_scorecards:
                     uploaded_at=_utc_now_iso(),
                     uploaded_by=uploader_username,
                 )
+                matches_with_scorecards.clear()
 
             st.success("Upload complete.")
             st.session_state["scorecard_uploader_nonce"] += 1
@@ -903,36 +934,33 @@ with tab_scorecards:
         # If a file was deleted directly in Dropbox, remove the stale DB record
         # so the UI does not show phantom uploads.
         try:
-            access_token = get_access_token(app_key, app_secret, refresh_token)
+            access_token = _cached_access_token(app_key, app_secret, refresh_token)
             match_folder = posixpath.join(scorecards_root, match_id)
 
             dbx_entries = list_folder(access_token, match_folder)
 
-            # Normalise to a comparable set of paths.
+            # Normalise to a case-folded set of paths (Dropbox paths are case-insensitive).
             # Dropbox may return path_display and/or path_lower.
-            dbx_paths = set()
-            for e in dbx_entries:
-                p_disp = e.get("path_display")
-                p_low = e.get("path_lower")
-                if p_disp:
-                    dbx_paths.add(str(p_disp))
-                    dbx_paths.add(str(p_disp).lower())
-                if p_low:
-                    dbx_paths.add(str(p_low))
-                    dbx_paths.add(str(p_low).lower())
+            dbx_paths = {
+                str(p).casefold()
+                for e in dbx_entries
+                for p in (e.get("path_display"), e.get("path_lower"))
+                if p
+            }
 
             stale = []
             for row in existing:
                 p = str(row.get("dropbox_path", "") or "")
                 if not p:
                     continue
-                if p not in dbx_paths and p.lower() not in dbx_paths:
+                if p.casefold() not in dbx_paths:
                     stale.append(p)
 
             # Auto-clean stale records (Dropbox file already gone)
             if stale:
                 for p in stale:
                     delete_scorecard_by_path(p)
+                matches_with_scorecards.clear()
 
                 # Re-load now-clean list for display
                 existing = list_scorecards(match_id)
@@ -979,9 +1007,10 @@ with tab_scorecards:
                         key=f"scorecard_del_btn_{scorecard_id}",
                     ):
                         try:
-                            access_token = get_access_token(app_key, app_secret, refresh_token)
+                            access_token = _cached_access_token(app_key, app_secret, refresh_token)
                             delete_path(access_token, dbx_path)          # remove from Dropbox
                             delete_scorecard_by_path(dbx_path)           # remove from SQLite
+                            matches_with_scorecards.clear()
                             st.success("Deleted.")
                         except Exception as e:
                             st.error(f"Delete failed: {e}")
@@ -1008,7 +1037,7 @@ with tab_scorecards:
             key=f"scorecard_delete_all_btn_{match_id}",
         ):
             try:
-                access_token = get_access_token(app_key, app_secret, refresh_token)
+                access_token = _cached_access_token(app_key, app_secret, refresh_token)
 
                 # 1) Delete all SQLite rows for this match
                 existing_rows = list_scorecards(match_id)
@@ -1016,6 +1045,7 @@ with tab_scorecards:
                     p = str(row.get("dropbox_path", "") or "")
                     if p:
                         delete_scorecard_by_path(p)
+                matches_with_scorecards.clear()
 
                 # 2) Delete the entire Dropbox folder for this match (removes all files inside)
                 match_folder = posixpath.join(scorecards_root, match_id)
@@ -1239,7 +1269,7 @@ with tab_fantasy_blocks:
                     st.stop()
 
                 with st.spinner("Scoring block from Dropbox..."):
-                    access_token = get_access_token(app_key, app_secret, refresh_token)
+                    access_token = _cached_access_token(app_key, app_secret, refresh_token)
                     xbytes = download_file(access_token, dropbox_file_path)
                     table_name = f"Week{current_block}Stats"
                     week_df, table_found = _load_named_table_from_xlsm_bytes(xbytes, table_name)
@@ -1631,7 +1661,7 @@ with tab_fantasy_blocks:
                     )
                     st.success("Fantasy backup uploaded.")
                     try:
-                        access_token = get_access_token(app_key, app_secret, refresh_token)
+                        access_token = _cached_access_token(app_key, app_secret, refresh_token)
                         raw = download_file(access_token, backup_path)
                         json.loads(raw.decode("utf-8"))
                         st.success("Backup verified (download + parse OK).")
@@ -1371,59 +1371,112 @@ def save_fantasy_entry(
         conn.close()
 
 
+def _fetch_fantasy_entry(
+    conn: sqlite3.Connection, block_number: int, user_id: int
+) -> Optional[Dict[str, Any]]:
+    entry = conn.execute(
+        """
+        SELECT block_number, user_id, submitted_at, budget_used
+        FROM fantasy_entries
+        WHERE block_number = ? AND user_id = ?;
+        """,
+        (int(block_number), int(user_id)),
+    ).fetchone()
+    if not entry:
+        return None
+
+    rows = conn.execute(
+        """
+        SELECT player_id, is_starting, bench_order, is_captain, is_vice_captain
+        FROM fantasy_entry_players
+        WHERE block_number = ? AND user_id = ?
+        ORDER BY player_id ASC;
+        """,
+        (int(block_number), int(user_id)),
+    ).fetchall()
+
+    squad = [str(r["player_id"]) for r in rows]
+    starting = [str(r["player_id"]) for r in rows if int(r["is_starting"]) == 1]
+    bench1 = ""
+    bench2 = ""
+    captain = ""
+    vice_captain = ""
+    for r in rows:
+        pid = str(r["player_id"])
+        if r["bench_order"] == 1:
+            bench1 = pid
+        elif r["bench_order"] == 2:
+            bench2 = pid
+        if int(r["is_captain"]) == 1:
+            captain = pid
+        if int(r["is_vice_captain"]) == 1:
+            vice_captain = pid
+
+    return {
+        "block_number": int(entry["block_number"]),
+        "user_id": int(entry["user_id"]),
+        "submitted_at": entry["submitted_at"],
+        "budget_used": float(entry["budget_used"]),
+        "squad_player_ids": squad,
+        "starting_player_ids": starting,
+        "bench1": bench1 or None,
+        "bench2": bench2 or None,
+        "captain_id": captain or None,
+        "vice_captain_id": vice_captain or None,
+    }
+
+
 def get_fantasy_entry(block_number: int, user_id: int) -> Optional[Dict[str, Any]]:
     ensure_fantasy_team_tables_exist()
     conn = get_conn()
     try:
-        entry = conn.execute(
+        return _fetch_fantasy_entry(conn, block_number, user_id)
+    finally:
+        conn.close()
+
+
+def get_block_results_bundle(block_number: int, user_id: int) -> Dict[str, Any]:
+    """
+    Everything the Results tab needs for one block, read over a single connection:
+    entry (or None), prices, player points, and the user's total (or None).
+    """
+    ensure_fantasy_team_tables_exist()
+    ensure_fantasy_scoring_tables_exist()
+    conn = get_conn()
+    try:
+        block_number = int(block_number)
+        user_id = int(user_id)
+        user_row = conn.execute(
             """
-            SELECT block_number, user_id, submitted_at, budget_used
-            FROM fantasy_entries
+            SELECT points_total
+            FROM fantasy_block_user_points
             WHERE block_number = ? AND user_id = ?;
             """,
-            (int(block_number), int(user_id)),
+            (block_number, user_id),
         ).fetchone()
-        if not entry:
-            return None
-
-        rows = conn.execute(
+        price_rows = conn.execute(
             """
-            SELECT player_id, is_starting, bench_order, is_captain, is_vice_captain
-            FROM fantasy_entry_players
-            WHERE block_number = ? AND user_id = ?
+            SELECT player_id, price
+            FROM fantasy_prices
+            WHERE block_number = ?
             ORDER BY player_id ASC;
             """,
-            (int(block_number), int(user_id)),
+            (block_number,),
+        ).fetchall()
+        point_rows = conn.execute(
+            """
+            SELECT player_id, points
+            FROM fantasy_block_player_points
+            WHERE block_number = ?
+            ORDER BY player_id ASC;
+            """,
+            (block_number,),
         ).fetchall()
-
-        squad = [str(r["player_id"]) for r in rows]
-        starting = [str(r["player_id"]) for r in rows if int(r["is_starting"]) == 1]
-        bench1 = ""
-        bench2 = ""
-        captain = ""
-        vice_captain = ""
-        for r in rows:
-            pid = str(r["player_id"])
-            if r["bench_order"] == 1:
-                bench1 = pid
-            elif r["bench_order"] == 2:
-                bench2 = pid
-            if int(r["is_captain"]) == 1:
-                captain = pid
-            if int(r["is_vice_captain"]) == 1:
-                vice_captain = pid
-
         return {
-            "block_number": int(entry["block_number"]),
-            "user_id": int(entry["user_id"]),
-            "submitted_at": entry["submitted_at"],
-            "budget_used": float(entry["budget_used"]),
-            "squad_player_ids": squad,
-            "starting_player_ids": starting,
-            "bench1": bench1 or None,
-            "bench2": bench2 or None,
-            "captain_id": captain or None,
-            "vice_captain_id": vice_captain or None,
+            "entry": _fetch_fantasy_entry(conn, block_number, user_id),
+            "prices": {str(r["player_id"]): float(r["price"]) for r in price_rows},
+            "points": {str(r["player_id"]): float(r["points"]) for r in point_rows},
+            "user_total": float(user_row["points_total"]) if user_row else None,
         }
     finally:
         conn.close()
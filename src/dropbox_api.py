@@ -12,6 +12,7 @@ UPLOAD_URL = "https://content.dropboxapi.com/2/files/upload"
 LIST_FOLDER_URL = "https://api.dropboxapi.com/2/files/list_folder"
 DELETE_URL = "https://api.dropboxapi.com/2/files/delete_v2"
 CREATE_FOLDER_URL = "https://api.dropboxapi.com/2/files/create_folder_v2"
+GET_METADATA_URL = "https://api.dropboxapi.com/2/files/get_metadata"
 
 def get_access_token(app_key: str, app_secret: str, refresh_token: str, timeout_s: int = 30) -> str:
     data = {
@@ -43,6 +44,21 @@ def download_file(access_token: str, dropbox_path: str, timeout_s: int = 60) ->
 
     return r.content
 
+
+def get_file_rev(access_token: str, dropbox_path: str, timeout_s: int = 30) -> str:
+    """
+    Return the Dropbox revision id ("rev") of a file.
+    The rev changes whenever the file content changes, so it is a cheap cache key.
+    """
+    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
+    payload = {"path": dropbox_path}
+
+    r = requests.post(GET_METADATA_URL, headers=headers, json=payload, timeout=timeout_s)
+    if not r.ok:
+        raise RuntimeError(f"Dropbox get_metadata error {r.status_code}: {r.text}")
+
+    return str(r.json().get("rev") or "")
+
 def ensure_folder(access_token: str, dropbox_folder_path: str, timeout_s: int = 30) -> None:
     """
     Create a folder if it doesn't exist. Safe to call repeatedly.
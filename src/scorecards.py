@@ -0,0 +1,15 @@
+"""Shared scorecard lookups cached across Streamlit pages and sessions."""
+
+import streamlit as st
+
+from src.db import list_scorecard_match_ids
+
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def matches_with_scorecards() -> frozenset[str]:
+    """
+    All MatchIDs with at least one upload, from a single DISTINCT query.
+    Immutable, so it is shared as a resource rather than unpickled per call.
+    Call matches_with_scorecards.clear() after adding or deleting a scorecard.
+    """
+    return frozenset(list_scorecard_match_ids())